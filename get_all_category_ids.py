@@ -8,14 +8,33 @@ and displays all category IDs in a format ready to paste into migrator.py.
 API Endpoint: GET /categories/{category_id}
 Documentation: https://desk.zoho.com/support/APIDocument.do#KBCategory#KBCategory_Getacategorytree
 """
-import os
-import json
+import re
+import sys
+import difflib
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from src.config import get_config
 from src.zoho_auth import ZohoAuth
+from src.zoho_categories import fetch_subtree, flatten_category_tree
+
+# orjson is much faster at writing big JSON files - use it when installed
+try:
+    import orjson
+
+    def dump_json(obj, path):
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+except ImportError:
+    import json
+
+    def dump_json(obj, path):
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2)
 
 
 # Department IDs
@@ -26,99 +45,44 @@ SJRRC_DEPT_ID = '986740000000403042'
 ACE_ROOT_CAT_ID = '986740000000424001'
 SJRRC_ROOT_CAT_ID = '986740000000262194'
 
-
-def get_category_tree(auth, org_id, category_id):
-    """
-    Fetch the complete category tree starting from a category ID.
-    
-    This uses the Zoho Desk API endpoint:
-    GET /categories/{category_id}
-    
-    Returns the category and all its children recursively.
-    """
-    import requests
-    
-    if not auth.access_token:
-        auth.get_access_token()
-    
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {auth.access_token}",
-        "orgId": org_id
-    }
-    
-    url = f"https://desk.zoho.com/api/v1/categories/{category_id}"
-    
-    try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"[ERROR] Failed to fetch category {category_id}: {e}")
-        if hasattr(e, 'response') and e.response:
-            print(f"[ERROR] Response: {e.response.text}")
-        return None
-
-
-def flatten_category_tree(category_data, categories_list=None, parent_name="", depth=0):
-    """
-    Recursively flatten a category tree into a list.
-    
-    Args:
-        category_data (dict): Category object from API
-        categories_list (list): Accumulator for flattened categories
-        parent_name (str): Name of parent category for display
-        depth (int): Current depth in tree
-    
-    Returns:
-        list: Flattened list of category dicts
-    """
-    if categories_list is None:
-        categories_list = []
-    
-    if not category_data:
-        return categories_list
-    
-    # Add current category
-    cat_info = {
-        'id': category_data.get('id'),
-        'name': category_data.get('name'),
-        'parent_name': parent_name,
-        'depth': depth,
-        'has_children': bool(category_data.get('categories'))
-    }
-    categories_list.append(cat_info)
-    
-    # Recursively process children
-    children = category_data.get('categories', [])
-    for child in children:
-        flatten_category_tree(
-            child, 
-            categories_list, 
-            parent_name=category_data.get('name'),
-            depth=depth + 1
-        )
-    
-    return categories_list
+# Precomputed indentation for each tree depth
+INDENTS = ["  " * depth for depth in range(32)]
 
 
 def display_categories(dept_name, categories):
     """
     Display categories in a readable format with tree structure.
+
+    Accepts any iterable of CatInfo entries, including the iter_categories
+    generator. All lines are built first and written to stdout in one
+    call, rather than two print() calls per category.
     """
-    print(f"\n{'=' * 80}")
-    print(f"{dept_name} DEPARTMENT - COMPLETE CATEGORY TREE")
-    print(f"{'=' * 80}")
-    print(f"Total categories: {len(categories)}")
-    print()
+    lines = []
     
     for cat in categories:
-        indent = "  " * cat['depth']
-        parent_info = f" (under {cat['parent_name']})" if cat['parent_name'] else ""
-        children_info = " [has children]" if cat['has_children'] else ""
+        depth = cat.depth
+        indent = INDENTS[depth] if depth < len(INDENTS) else "  " * depth
+        parent_info = f" (under {cat.parent_name})" if cat.parent_name else ""
+        children_info = " [has children]" if cat.has_children else ""
         
-        print(f"{indent}📁 {cat['name']}{parent_info}{children_info}")
-        print(f"{indent}   ID: {cat['id']}")
-        print()
+        lines.append(f"{indent}📁 {cat.name}{parent_info}{children_info}\n{indent}   ID: {cat.id}\n\n")
+    
+    header = (
+        f"\n{'=' * 80}\n"
+        f"{dept_name} DEPARTMENT - COMPLETE CATEGORY TREE\n"
+        f"{'=' * 80}\n"
+        f"Total categories: {len(lines)}\n"
+        "\n"
+    )
+    sys.stdout.write(header + ''.join(lines))
+
+
+def normalize_name(name):
+    """
+    Normalize a category name for matching: lowercase, trimmed, and with
+    runs of whitespace collapsed to a single space.
+    """
+    return re.sub(r'\s+', ' ', (name or '').strip().lower())
 
 
 def create_mapping_code(sjrrc_categories, ace_categories):
@@ -133,18 +97,29 @@ def create_mapping_code(sjrrc_categories, ace_categories):
     print("\n# Copy this into src/migrator.py category_map:")
     print("self.category_map = {")
     
-    # Create a lookup dict for ACE categories by name
-    ace_by_name = {cat['name']: cat['id'] for cat in ace_categories}
+    # Create a lookup dict for ACE categories by normalized name, so
+    # differences in case or spacing don't count as a mismatch
+    ace_by_name = {normalize_name(cat.name): cat for cat in ace_categories}
+    ace_names = list(ace_by_name)
     
     # Try to match SJRRC categories to ACE categories
     for sjrrc_cat in sjrrc_categories:
-        sjrrc_name = sjrrc_cat['name']
-        sjrrc_id = sjrrc_cat['id']
+        sjrrc_name = sjrrc_cat.name
+        sjrrc_id = sjrrc_cat.id
+        key = normalize_name(sjrrc_name)
         
         # Look for matching name in ACE
-        if sjrrc_name in ace_by_name:
-            ace_id = ace_by_name[sjrrc_name]
+        if key in ace_by_name:
+            ace_id = ace_by_name[key].id
             print(f"    '{sjrrc_id}': '{ace_id}',  # {sjrrc_name}")
+            continue
+        
+        # No exact match - suggest the closest ACE name, if any is close enough
+        close = difflib.get_close_matches(key, ace_names, n=1, cutoff=0.8)
+        if close:
+            suggestion = ace_by_name[close[0]]
+            print(f"    '{sjrrc_id}': 'NEEDS_MAPPING',  # {sjrrc_name} -> ??? "
+                  f"(closest: '{suggestion.name}' = {suggestion.id})")
         else:
             # No match found - needs manual mapping
             print(f"    '{sjrrc_id}': 'NEEDS_MAPPING',  # {sjrrc_name} -> ???")
@@ -155,6 +130,15 @@ def create_mapping_code(sjrrc_categories, ace_categories):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Fetch all category IDs for both departments.")
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help="Ignore cached category data and fetch fresh from the API"
+    )
+    args = parser.parse_args()
+    cfg = get_config()
+
     print("=" * 80)
     print("COMPLETE CATEGORY ID FETCHER")
     print(f"Started at {datetime.now()}")
@@ -165,9 +149,9 @@ def main():
     # Set up authentication
     print("\n[1/4] Authenticating...")
     auth = ZohoAuth(
-        client_id=os.environ['ZOHO_CLIENT_ID'],
-        client_secret=os.environ['ZOHO_CLIENT_SECRET'],
-        refresh_token=os.environ['ZOHO_REFRESH_TOKEN']
+        client_id=cfg.client_id,
+        client_secret=cfg.client_secret,
+        refresh_token=cfg.refresh_token
     )
     
     if not auth.get_access_token():
@@ -176,27 +160,30 @@ def main():
     
     print("✓ Authentication successful")
     
-    org_id = os.environ['ZOHO_ORG_ID']
-    
-    # Fetch ACE department categories
-    print("\n[2/4] Fetching ACE department category tree...")
-    ace_tree = get_category_tree(auth, org_id, ACE_ROOT_CAT_ID)
-    
+    org_id = cfg.org_id
+
+    # Fetch both department trees at the same time - the two requests are
+    # independent, so we only wait for the slower one instead of both.
+    # The token was already fetched above, so both threads reuse it.
+    print("\n[2/4] Fetching ACE and SJRRC department category trees...")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        ace_future = executor.submit(fetch_subtree, auth, org_id, ACE_ROOT_CAT_ID, refresh=args.refresh)
+        sjrrc_future = executor.submit(fetch_subtree, auth, org_id, SJRRC_ROOT_CAT_ID, refresh=args.refresh)
+        ace_tree = ace_future.result()
+        sjrrc_tree = sjrrc_future.result()
+
     if not ace_tree:
         print("✗ Failed to fetch ACE categories")
         return
-    
-    ace_categories = flatten_category_tree(ace_tree)
-    print(f"✓ Found {len(ace_categories)} ACE categories")
-    
-    # Fetch SJRRC department categories
-    print("\n[3/4] Fetching SJRRC department category tree...")
-    sjrrc_tree = get_category_tree(auth, org_id, SJRRC_ROOT_CAT_ID)
-    
+
     if not sjrrc_tree:
         print("✗ Failed to fetch SJRRC categories")
         return
-    
+
+    print("\n[3/4] Flattening category trees...")
+    ace_categories = flatten_category_tree(ace_tree)
+    print(f"✓ Found {len(ace_categories)} ACE categories")
+
     sjrrc_categories = flatten_category_tree(sjrrc_tree)
     print(f"✓ Found {len(sjrrc_categories)} SJRRC categories")
     
@@ -228,13 +215,12 @@ def main():
     
     # Save raw data to JSON for reference
     output_file = 'category_data.json'
-    with open(output_file, 'w') as f:
-        json.dump({
-            'ace_categories': ace_categories,
-            'sjrrc_categories': sjrrc_categories,
-            'ace_tree': ace_tree,
-            'sjrrc_tree': sjrrc_tree
-        }, f, indent=2)
+    dump_json({
+        'ace_categories': [cat._asdict() for cat in ace_categories],
+        'sjrrc_categories': [cat._asdict() for cat in sjrrc_categories],
+        'ace_tree': ace_tree,
+        'sjrrc_tree': sjrrc_tree
+    }, output_file)
     
     print(f"\n✓ Raw data saved to {output_file} for reference")
 
@@ -2,14 +2,18 @@
 List ALL categories by fetching the category tree for each department.
 Uses the correct Zoho Desk API endpoints.
 """
-import os
+import sys
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
-import requests
 
 load_dotenv()
 
+from src.config import get_config
 from src.zoho_auth import ZohoAuth
+from src.zoho_categories import fetch_subtree
 
 
 ACE_DEPT_ID = '986740000000006907'
@@ -19,82 +23,93 @@ SJRRC_DEPT_ID = '986740000000403042'
 ACE_ROOT_CAT_ID = '986740000000424001'
 SJRRC_ROOT_CAT_ID = '986740000000262194'
 
+# Precomputed indentation for each tree depth
+INDENTS = ["  " * depth for depth in range(64)]
 
-def get_category_tree(auth, org_id, category_id):
-    """
-    Fetch category tree for a specific category.
-    """
-    if not auth.access_token:
-        auth.get_access_token()
-    
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {auth.access_token}",
-        "orgId": org_id
-    }
-    
-    url = f"https://desk.zoho.com/api/v1/categories/{category_id}"
-    
-    try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        print(f"Error fetching category {category_id}: {e}")
-        if hasattr(e, 'response') and e.response:
-            print(f"Response: {e.response.text}")
-        return None
-
-
-def print_category_tree(category_data, indent=0):
+
+def print_category_tree(category_data):
     """
-    Recursively print category tree.
+    Print a category tree, one name/ID pair per category.
+
+    Walks the tree with an explicit stack rather than recursion, and
+    writes each category's two lines with a single write call.
     """
     if not category_data:
         return
     
-    name = category_data.get('name', 'Unknown')
-    cat_id = category_data.get('id', 'Unknown')
+    write = sys.stdout.write
+    stack = [(category_data, 0)]
     
-    print("  " * indent + f"{name}")
-    print("  " * indent + f"  ID: {cat_id}")
-    
-    # Check for child categories
-    if 'categories' in category_data and category_data['categories']:
-        for child in category_data['categories']:
-            print_category_tree(child, indent + 1)
+    while stack:
+        node, indent = stack.pop()
+        prefix = INDENTS[indent] if indent < len(INDENTS) else "  " * indent
+        
+        write(f"{prefix}{node.get('name', 'Unknown')}\n{prefix}  ID: {node.get('id', 'Unknown')}\n")
+        
+        # Push children in reverse so they print in their original order
+        for child in reversed(node.get('categories') or ()):
+            stack.append((child, indent + 1))
 
 
 def main():
+    parser = argparse.ArgumentParser(description="List the category tree for both departments.")
+    parser.add_argument(
+        '--dump-raw',
+        action='store_true',
+        help="Also print the raw API responses as JSON"
+    )
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help="Ignore cached category data and fetch fresh from the API"
+    )
+    args = parser.parse_args()
+    cfg = get_config()
+
     print("=" * 70)
     print("COMPLETE CATEGORY TREE LISTING")
     print(f"Started at {datetime.now()}")
     print("=" * 70)
     
     auth = ZohoAuth(
-        client_id=os.environ['ZOHO_CLIENT_ID'],
-        client_secret=os.environ['ZOHO_CLIENT_SECRET'],
-        refresh_token=os.environ['ZOHO_REFRESH_TOKEN']
+        client_id=cfg.client_id,
+        client_secret=cfg.client_secret,
+        refresh_token=cfg.refresh_token
     )
     
     if not auth.get_access_token():
         print("X Authentication failed!")
         return
     
-    org_id = os.environ['ZOHO_ORG_ID']
-    
+    org_id = cfg.org_id
+
+    # Fetch both trees in parallel (the token is already cached above)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        ace_future = executor.submit(fetch_subtree, auth, org_id, ACE_ROOT_CAT_ID, refresh=args.refresh)
+        sjrrc_future = executor.submit(fetch_subtree, auth, org_id, SJRRC_ROOT_CAT_ID, refresh=args.refresh)
+        ace_tree = ace_future.result()
+        sjrrc_tree = sjrrc_future.result()
+
     print("\n" + "=" * 70)
     print("ACE DEPARTMENT CATEGORY TREE")
     print("=" * 70)
-    ace_tree = get_category_tree(auth, org_id, ACE_ROOT_CAT_ID)
     if ace_tree:
         print_category_tree(ace_tree)
-    
+
     print("\n" + "=" * 70)
     print("SJRRC DEPARTMENT CATEGORY TREE")
     print("=" * 70)
-    sjrrc_tree = get_category_tree(auth, org_id, SJRRC_ROOT_CAT_ID)
     if sjrrc_tree:
         print_category_tree(sjrrc_tree)
+
+    # The raw responses can be large, so only dump them when asked.
+    # json.dump streams straight to stdout instead of building one big string.
+    if args.dump_raw:
+        print("\n" + "=" * 70)
+        print("RAW API RESPONSES")
+        print("=" * 70)
+        json.dump({'ace_tree': ace_tree, 'sjrrc_tree': sjrrc_tree}, sys.stdout, indent=2)
+        print()
     
     print("\n" + "=" * 70)
     print("CATEGORY MAPPING GUIDE")
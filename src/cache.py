@@ -0,0 +1,98 @@
+"""
+In-memory caching helpers.
+Small bounded caches for API responses that are read repeatedly.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a fixed time.
+
+    Holds at most `maxsize` entries; adding one more evicts the least
+    recently used. Entries older than `ttl` seconds are treated as missing.
+
+    Usage:
+        cache = TTLCache(maxsize=4096, ttl=300)
+        cache.set(article_id, article)
+        article = cache.get(article_id)   # None once expired or evicted
+    """
+
+    def __init__(self, maxsize=4096, ttl=300):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of entries to keep
+            ttl (float): Seconds an entry stays valid after it is stored
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Look up an entry, marking it as recently used.
+
+        Args:
+            key: Cache key
+            default: Returned when the key is missing or expired
+
+        Returns:
+            The cached value, or `default`
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """
+        Store an entry, evicting the least recently used one if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """
+        Remove an entry.
+
+        Args:
+            key: Cache key
+            default: Returned when the key isn't cached
+
+        Returns:
+            The removed value, or `default`
+        """
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return entry[0] if entry else default
+
+    def clear(self):
+        """
+        Remove every entry.
+        """
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
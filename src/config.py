@@ -0,0 +1,71 @@
+"""
+Zoho credentials configuration module.
+Reads the ZOHO_* environment variables once, the first time they're needed.
+"""
+import os
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+# Environment variables every script needs, checked together up front
+REQUIRED_ENV = ('ZOHO_CLIENT_ID', 'ZOHO_CLIENT_SECRET', 'ZOHO_REFRESH_TOKEN', 'ZOHO_ORG_ID')
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """
+    Zoho API credentials and organization settings.
+
+    Attributes:
+        client_id (str): Zoho API client ID (ZOHO_CLIENT_ID)
+        client_secret (str): Zoho API client secret (ZOHO_CLIENT_SECRET)
+        refresh_token (str): Permanent refresh token (ZOHO_REFRESH_TOKEN)
+        org_id (str): Zoho Desk organization ID (ZOHO_ORG_ID)
+    """
+    client_id: str
+    client_secret: str
+    refresh_token: str
+    org_id: str
+
+
+def load_config():
+    """
+    Build a Config from the environment.
+
+    Scripts that use a .env file must call load_dotenv() before the
+    first call.
+
+    Returns:
+        Config: The loaded settings
+
+    Raises:
+        SystemExit: If any required variable isn't set. The message names
+                    every missing variable, not just the first.
+    """
+    missing = [name for name in REQUIRED_ENV if not os.environ.get(name)]
+    if missing:
+        sys.exit(f"X Missing environment variables: {', '.join(missing)}")
+
+    return Config(**{
+        name[len('ZOHO_'):].lower(): os.environ[name]
+        for name in REQUIRED_ENV
+    })
+
+
+@lru_cache(maxsize=None)
+def get_config():
+    """
+    Get the settings, loading them from the environment on first use.
+
+    Scripts call this at the start of main(), after parsing their
+    arguments, so --help works without credentials while missing ones
+    still fail before any network call.
+
+    Returns:
+        Config: The loaded settings (the same object on every call)
+
+    Raises:
+        SystemExit: If any required variable isn't set (see load_config)
+    """
+    return load_config()
@@ -2,6 +2,17 @@
 Migration logic for Zoho Desk articles.
 Handles category mapping and article transformation.
 """
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from src.rate_limiter import RateLimiter
+
+
+logger = logging.getLogger(__name__)
+
+# Article fields copied to the destination only when the source has them
+OPTIONAL_FIELDS = ('status', 'tags', 'summary')
 
 
 class ArticleMigrator:
@@ -27,6 +38,13 @@ class ArticleMigrator:
         self.destination_api = destination_api or source_api
         self.migration_log = []
         
+        # Worker threads record results in their own buffer (no shared lock
+        # on the per-article path). flush_log() merges them into
+        # migration_log once a batch is done.
+        self._local = threading.local()
+        self._log_buffers = []
+        self._log_lock = threading.Lock()
+        
         # Category mapping: SJRRC category ID -> ACE category ID
         # This maps categories by name based on your current structure
         # Format: 'source_category_id': 'destination_category_id'
@@ -57,6 +75,21 @@ class ArticleMigrator:
             '986740000000703694': 'PLACEHOLDER_EMPLOYMENT',         # Employment
             '986740000000716054': 'PLACEHOLDER_MAINTENANCE',        # Maintenance
         }
+        
+        # Split the map once up front so map_category_id doesn't have to
+        # check for placeholders on every call
+        self._valid_map = {}
+        self._placeholder_ids = {}
+        for source_id, destination_id in self.category_map.items():
+            if destination_id.startswith('PLACEHOLDER_'):
+                self._placeholder_ids[source_id] = destination_id
+            else:
+                self._valid_map[source_id] = destination_id
+        
+        # Reverse index: destination category ID -> source category IDs
+        self._dest_to_source = {}
+        for source_id, destination_id in self._valid_map.items():
+            self._dest_to_source.setdefault(destination_id, []).append(source_id)
     
     def map_category_id(self, source_category_id):
         """
@@ -68,20 +101,33 @@ class ArticleMigrator:
         Returns:
             str: Mapped category ID for destination, or None if no mapping
         """
-        mapped_id = self.category_map.get(source_category_id)
+        mapped_id = self._valid_map.get(source_category_id)
         
-        if not mapped_id:
-            print(f"[Migrator] WARNING: No mapping found for category ID {source_category_id}")
-            return None
+        if mapped_id:
+            return mapped_id
         
-        if mapped_id.startswith('PLACEHOLDER_'):
-            print(f"[Migrator] ERROR: Category mapping is a placeholder: {mapped_id}")
-            print(f"[Migrator] You need to create this category in ACE and update the mapping")
+        if source_category_id in self._placeholder_ids:
+            logger.error("[Migrator] ERROR: Category mapping is a placeholder: %s",
+                         self._placeholder_ids[source_category_id])
+            logger.error("[Migrator] You need to create this category in ACE and update the mapping")
             return None
         
-        return mapped_id
+        logger.warning("[Migrator] WARNING: No mapping found for category ID %s", source_category_id)
+        return None
     
-    def transform_article(self, source_article, destination_department_id):
+    def sources_for_destination(self, destination_category_id):
+        """
+        Find the source categories whose articles go to a destination category.
+        
+        Args:
+            destination_category_id (str): Category ID in the destination department
+            
+        Returns:
+            list: Source category IDs mapped to it (empty if none)
+        """
+        return self._dest_to_source.get(destination_category_id, [])
+    
+    def transform_article(self, source_article, destination_department_id, source_category_id=None):
         """
         Transform a source article for creation in destination department.
         
@@ -91,12 +137,15 @@ class ArticleMigrator:
         Args:
             source_article (dict): Complete article from source
             destination_department_id (str): Target department ID
+            source_category_id (str, optional): The article's categoryId, if the
+                                                caller already looked it up
             
         Returns:
             dict: Transformed article data ready for creation, or None if error
         """
         # Map the category ID
-        source_category_id = source_article.get('categoryId')
+        if source_category_id is None:
+            source_category_id = source_article.get('categoryId')
         destination_category_id = self.map_category_id(source_category_id)
         
         if not destination_category_id:
@@ -111,17 +160,12 @@ class ArticleMigrator:
             'departmentId': destination_department_id,
         }
         
-        # Optional fields - include if present
-        if 'status' in source_article:
-            transformed['status'] = source_article.get('status')
-        
-        # Tags - preserve if present
-        if 'tags' in source_article and source_article['tags']:
-            transformed['tags'] = source_article['tags']
-        
-        # Summary/excerpt - preserve if present
-        if 'summary' in source_article and source_article['summary']:
-            transformed['summary'] = source_article['summary']
+        # Optional fields (status, tags, summary/excerpt) - include if
+        # present and non-empty, with a single lookup per field
+        for field in OPTIONAL_FIELDS:
+            value = source_article.get(field)
+            if value:
+                transformed[field] = value
         
         return transformed
     
@@ -137,10 +181,143 @@ class ArticleMigrator:
         Returns:
             dict: Migration result with status and details
         """
-        print(f"\n{'[DRY RUN] ' if dry_run else ''}Migrating article {article_id}...")
+        return self.migrate_many([article_id], destination_department_id, dry_run=dry_run)[0]
+    
+    def migrate_many(self, article_ids, destination_department_id, dry_run=False,
+                     max_workers=8, requests_per_minute=100):
+        """
+        Migrate several articles, overlapping the network calls.
         
-        # Fetch the source article
-        source_article = self.source_api.get_article_by_id(article_id)
+        Source articles are fetched on a thread pool. As each one arrives it
+        is transformed on the calling thread, then its create_article call is
+        handed to a second pool. A shared rate limiter keeps the combined
+        request rate of both pools under Zoho's per-minute limit.
+        
+        If the API clients were created with their own requests_per_minute,
+        pass requests_per_minute=None here to rely on their limiter instead.
+        Theirs only counts requests that actually go out, not cache hits.
+        
+        An ID listed more than once is migrated once; each copy in the
+        returned list is that one result.
+        
+        Args:
+            article_ids (list): Source article IDs to migrate
+            destination_department_id (str): Target department ID
+            dry_run (bool): If True, only show what would happen without creating
+            max_workers (int): Threads per pool (fetching and creating)
+            requests_per_minute (int, optional): Combined API request budget
+                                                 (None disables this limiter)
+            
+        Returns:
+            list: Migration result dicts, in the same order as article_ids
+        """
+        limiter = RateLimiter(requests_per_minute) if requests_per_minute else None
+        
+        def fetch(article_id):
+            if limiter:
+                limiter.acquire()
+            # A dry run may use a cached copy, but a real migration always
+            # copies the article as it is in Zoho right now
+            return self.source_api.get_article_by_id(article_id, bypass_cache=not dry_run)
+        
+        def create(article_id, source_article, transformed):
+            if limiter:
+                limiter.acquire()
+            created_article = self.destination_api.create_article(transformed)
+            result = self._creation_result(article_id, source_article, created_article)
+            self._record(result)
+            return result
+        
+        # Never fetch or create the same article twice
+        unique_ids = list(dict.fromkeys(article_ids))
+        results = {}
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as fetch_pool, \
+                ThreadPoolExecutor(max_workers=max_workers) as create_pool:
+            fetch_futures = {
+                fetch_pool.submit(fetch, article_id): article_id
+                for article_id in unique_ids
+            }
+            create_futures = {}
+            
+            for future in as_completed(fetch_futures):
+                article_id = fetch_futures[future]
+                source_article = future.result()
+                
+                result, transformed = self._prepare_article(
+                    article_id, source_article, destination_department_id, dry_run
+                )
+                
+                if result:
+                    self._record(result)
+                    results[article_id] = result
+                else:
+                    future = create_pool.submit(create, article_id, source_article, transformed)
+                    create_futures[future] = article_id
+            
+            for future in as_completed(create_futures):
+                results[create_futures[future]] = future.result()
+        
+        self.flush_log()
+        return [results[article_id] for article_id in article_ids]
+    
+    def _record(self, result):
+        """
+        Add a migration result to the current thread's log buffer.
+        
+        Args:
+            result (dict): Migration result to record
+        """
+        buffer = getattr(self._local, 'buffer', None)
+        
+        if buffer is None:
+            # First result from this thread - register its buffer once
+            buffer = self._local.buffer = []
+            with self._log_lock:
+                self._log_buffers.append((threading.current_thread(), buffer))
+        
+        buffer.append(result)
+    
+    def flush_log(self):
+        """
+        Move results from every thread's buffer into migration_log.
+        
+        Called automatically at the end of migrate_many.
+        
+        Returns:
+            list: The updated migration_log
+        """
+        with self._log_lock:
+            for _, buffer in self._log_buffers:
+                pending = buffer[:]
+                del buffer[:len(pending)]
+                self.migration_log.extend(pending)
+            
+            # Forget buffers belonging to threads that have finished
+            self._log_buffers = [
+                (thread, buffer) for thread, buffer in self._log_buffers
+                if thread.is_alive() or buffer
+            ]
+        
+        return self.migration_log
+    
+    def _prepare_article(self, article_id, source_article, destination_department_id, dry_run):
+        """
+        Transform a fetched source article, ready for creation.
+        
+        Args:
+            article_id (str): Source article ID
+            source_article (dict): Fetched source article, or None if the fetch failed
+            destination_department_id (str): Target department ID
+            dry_run (bool): Whether this is a dry run
+            
+        Returns:
+            tuple: (result, transformed). result is a finished migration result
+                   when there is nothing to create (fetch failed, mapping failed,
+                   or dry run), otherwise None and transformed holds the data
+                   to create.
+        """
+        logger.info("\n%sMigrating article %s...", '[DRY RUN] ' if dry_run else '', article_id)
         
         if not source_article:
             result = {
@@ -148,50 +325,65 @@ class ArticleMigrator:
                 'status': 'failed',
                 'error': 'Failed to fetch source article'
             }
-            self.migration_log.append(result)
-            return result
+            return result, None
+        
+        # Look up the fields we use more than once
+        get = source_article.get
+        title = get('title')
+        source_category_id = get('categoryId')
         
-        print(f"[Migrator] Source article: {source_article.get('title')}")
-        print(f"[Migrator] Source category ID: {source_article.get('categoryId')}")
-        print(f"[Migrator] Source department ID: {source_article.get('departmentId')}")
+        logger.info("[Migrator] Source article: %s", title)
+        logger.info("[Migrator] Source category ID: %s", source_category_id)
+        logger.info("[Migrator] Source department ID: %s", get('departmentId'))
         
         # Check for tags
-        tags = source_article.get('tags', [])
+        tags = get('tags')
         if tags:
-            print(f"[Migrator] Tags: {', '.join(tags)}")
+            logger.info("[Migrator] Tags: %s", tags)
         else:
-            print(f"[Migrator] No tags found")
+            logger.info("[Migrator] No tags found")
         
         # Transform the article
-        transformed = self.transform_article(source_article, destination_department_id)
+        transformed = self.transform_article(
+            source_article, destination_department_id, source_category_id=source_category_id
+        )
         
         if not transformed:
             result = {
                 'article_id': article_id,
-                'title': source_article.get('title'),
+                'title': title,
                 'status': 'failed',
                 'error': 'Category mapping failed'
             }
-            self.migration_log.append(result)
-            return result
+            return result, None
         
-        print(f"[Migrator] Destination category ID: {transformed['categoryId']}")
-        print(f"[Migrator] Destination department ID: {transformed['departmentId']}")
+        logger.info("[Migrator] Destination category ID: %s", transformed['categoryId'])
+        logger.info("[Migrator] Destination department ID: %s", transformed['departmentId'])
         
         if dry_run:
             result = {
                 'article_id': article_id,
-                'title': source_article.get('title'),
+                'title': title,
                 'status': 'dry_run',
                 'source': source_article,
                 'transformed': transformed
             }
-            self.migration_log.append(result)
-            return result
+            return result, transformed
         
-        # Create the article in destination
-        created_article = self.destination_api.create_article(transformed)
+        return None, transformed
+    
+    def _creation_result(self, article_id, source_article, created_article):
+        """
+        Build the migration result for a create_article call.
         
+        Args:
+            article_id (str): Source article ID
+            source_article (dict): The source article that was migrated
+            created_article (dict): create_article response, or None if it failed
+            
+        Returns:
+            dict: Migration result with status and details
+        """
         if created_article:
             result = {
                 'article_id': article_id,
@@ -200,8 +392,8 @@ class ArticleMigrator:
                 'new_article_id': created_article.get('id'),
                 'new_permalink': created_article.get('permalink')
             }
-            print(f"[Migrator] SUCCESS! New article ID: {created_article.get('id')}")
-            print(f"[Migrator] Permalink: {created_article.get('permalink')}")
+            logger.info("[Migrator] SUCCESS! New article ID: %s", result['new_article_id'])
+            logger.info("[Migrator] Permalink: %s", result['new_permalink'])
         else:
             result = {
                 'article_id': article_id,
@@ -210,5 +402,4 @@ class ArticleMigrator:
                 'error': 'API creation failed'
             }
         
-        self.migration_log.append(result)
         return result
@@ -0,0 +1,61 @@
+"""
+Rate limiting helpers for Zoho Desk API calls.
+Keeps concurrent workers under Zoho's per-minute request limits.
+"""
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket rate limiter.
+
+    The bucket holds up to `burst` tokens and refills at `rate` tokens
+    every `per` seconds. Each call to acquire() takes one token, sleeping
+    first if the bucket is empty. One limiter can be shared by any number
+    of threads so their combined request rate stays under the limit.
+
+    Usage:
+        limiter = RateLimiter(rate=100, per=60)   # 100 requests per minute
+        limiter.acquire()
+        api.get_article_by_id(article_id)
+    """
+
+    def __init__(self, rate, per=60.0, burst=None):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate (int): Number of requests allowed per `per` seconds
+            per (float): Length of the rate window in seconds
+            burst (int, optional): Maximum tokens that can build up while idle
+                                   (defaults to `rate`)
+        """
+        self.capacity = burst or rate
+        self.fill_rate = rate / per
+        self.tokens = float(self.capacity)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Take one token, blocking until one is available.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity,
+                    self.tokens + (now - self.last_refill) * self.fill_rate
+                )
+                self.last_refill = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                # How long until the next token arrives
+                wait_time = (1 - self.tokens) / self.fill_rate
+
+            # Sleep outside the lock so other threads can check in
+            time.sleep(wait_time)
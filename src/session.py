@@ -0,0 +1,46 @@
+"""
+Shared HTTP session setup for Zoho API clients.
+Builds pooled requests sessions with retry and backoff.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# (connect, read) timeout in seconds for every Zoho request, so a stalled
+# connection fails and gets retried instead of hanging a worker forever
+DEFAULT_TIMEOUT = (5.0, 30.0)
+
+def build_session(pool_connections=10, pool_maxsize=20):
+    """
+    Create a requests.Session with connection pooling and retries.
+
+    Reusing one session keeps connections alive between calls, so only
+    the first request to a host pays for the TCP and TLS handshake.
+    Rate-limited (429) and transient server errors (5xx) are retried with
+    exponential backoff, waiting as long as Zoho's Retry-After header asks
+    when it sends one. urllib3 only retries idempotent methods
+    automatically, so POSTs are never sent twice.
+
+    Args:
+        pool_connections (int): Number of hosts to keep connection pools for
+        pool_maxsize (int): Maximum connections kept open per host
+
+    Returns:
+        requests.Session: Configured session
+    """
+    session = requests.Session()
+
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True
+        )
+    )
+    session.mount("https://", adapter)
+
+    return session
@@ -0,0 +1,43 @@
+"""
+Shared setup for the test scripts.
+Builds an authenticated Zoho Desk API client from the environment.
+"""
+# Pick up a local .env file before the credentials are read. python-dotenv
+# is optional - CI passes the credentials as real environment variables.
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+from src.config import get_config
+from src.zoho_auth import ZohoAuth
+from src.zoho_desk_api import ZohoDeskAPI
+
+
+def build_api(**api_kwargs):
+    """
+    Create a ZohoDeskAPI client with a valid access token.
+
+    Every script built on this shares the same setup: the on-disk token
+    cache, a pooled session, and any rate limit passed in.
+
+    Args:
+        **api_kwargs: Extra ZohoDeskAPI arguments (cache_maxsize,
+                      requests_per_minute, ...)
+
+    Returns:
+        ZohoDeskAPI: Ready-to-use client, or None if authentication failed
+    """
+    cfg = get_config()
+
+    auth = ZohoAuth(
+        client_id=cfg.client_id,
+        client_secret=cfg.client_secret,
+        refresh_token=cfg.refresh_token
+    )
+
+    if not auth.get_access_token():
+        return None
+
+    return ZohoDeskAPI(auth=auth, org_id=cfg.org_id, **api_kwargs)
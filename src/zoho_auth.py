@@ -2,8 +2,30 @@
 Zoho OAuth2 authentication module.
 Handles token refresh and management for Zoho API access.
 """
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+import urllib.parse
 import requests
-from datetime import datetime
+
+from src.session import DEFAULT_TIMEOUT, build_session
+
+
+# Access tokens are cached on disk so repeated script runs within the
+# token's lifetime (~1 hour) don't each need a refresh round-trip.
+# Set ZOHO_TOKEN_CACHE to move the file, or to an empty string to disable it.
+DEFAULT_TOKEN_CACHE = os.environ.get(
+    "ZOHO_TOKEN_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "zoho_desk", "token.json")
+)
+
+# Don't reuse a cached token that expires within this many seconds
+TOKEN_EXPIRY_LEEWAY = 60
+
+logger = logging.getLogger(__name__)
 
 
 class ZohoAuth:
@@ -13,14 +35,21 @@ class ZohoAuth:
     This class handles:
     - Storing OAuth credentials (client ID, secret, refresh token)
     - Refreshing access tokens when needed
+    - Caching the access token on disk so later runs can reuse it
     - Providing valid access tokens for API calls
     
+    Thread safety:
+        One instance can be shared between threads. Refreshes are
+        serialized, so when several threads find the token expired at once
+        only one of them calls Zoho and the rest reuse its new token.
+    
     Usage:
         auth = ZohoAuth(client_id, client_secret, refresh_token)
         access_token = auth.get_access_token()
     """
     
-    def __init__(self, client_id, client_secret, refresh_token):
+    def __init__(self, client_id, client_secret, refresh_token, token_cache_path=DEFAULT_TOKEN_CACHE,
+                 session=None, timeout=DEFAULT_TIMEOUT):
         """
         Initialize the authentication handler.
         
@@ -28,6 +57,12 @@ class ZohoAuth:
             client_id (str): Your Zoho API client ID
             client_secret (str): Your Zoho API client secret
             refresh_token (str): Your permanent refresh token from Zoho
+            token_cache_path (str, optional): File used to share the access token
+                                              between runs. None disables it.
+            session (requests.Session, optional): Session for token requests.
+                                                  A pooled session is created
+                                                  if not given.
+            timeout (float or tuple): Timeout for token requests, in seconds
         """
         self.client_id = client_id
         self.client_secret = client_secret
@@ -36,8 +71,40 @@ class ZohoAuth:
         # This will hold the current access token (expires in ~1 hour)
         self.access_token = None
         
+        # When the current token expires, on the time.monotonic() clock
+        self.access_token_expiry = 0.0
+        
+        # Bumped whenever access_token changes, so clients can cache
+        # anything built from the token until the next change
+        self._token_version = 0
+        
         # Zoho's OAuth token endpoint
         self.token_url = "https://accounts.zoho.com/oauth/v2/token"
+        
+        # The refresh request never changes, so encode it once. It goes in
+        # the POST body rather than the query string, which keeps the
+        # credentials out of URLs (and any logs that record them).
+        self._refresh_body = urllib.parse.urlencode({
+            "refresh_token": refresh_token,
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "grant_type": "refresh_token"
+        }).encode()
+        
+        self.token_cache_path = token_cache_path
+        
+        # Separate session for accounts.zoho.com (a different host from the API)
+        self.session = session or build_session(pool_connections=1, pool_maxsize=4)
+        self._owns_session = session is None
+        self.timeout = timeout
+        
+        # Only one refresh may be in flight at a time (see get_access_token)
+        self._refresh_lock = threading.Lock()
+        self._async_refresh_lock = None
+        
+        # Optional background refresher (see start_background_refresh)
+        self._refresh_thread = None
+        self._stop_refresh = threading.Event()
     
     def get_access_token(self):
         """
@@ -48,51 +115,308 @@ class ZohoAuth:
         2. Receive new access_token (valid for ~1 hour)
         3. Store and return the access_token
         
+        The current token is returned as-is until shortly before it
+        expires. If a token cached on disk by an earlier run is still
+        valid, it is used instead. In both cases no request is made.
+        
+        Safe to call from several threads at once: the refresh runs under
+        a lock, and threads that were waiting on it get the token the
+        first one fetched.
+        
         Returns:
             str: Valid access token, or None if refresh failed
         """
-        # Build the request parameters per Zoho's OAuth2 spec
-        params = {
-            "refresh_token": self.refresh_token,
-            "client_id": self.client_id,
-            "client_secret": self.client_secret,
-            "grant_type": "refresh_token"
-        }
+        if self.is_token_valid():
+            return self.access_token
+        
+        with self._refresh_lock:
+            # Another thread may have refreshed while we waited for the lock
+            if self.is_token_valid():
+                return self.access_token
+            
+            cached = self._load_cached_token()
+            if cached:
+                self._set_token(*cached)
+                return self.access_token
+            
+            return self._refresh_access_token()
+    
+    async def a_get_access_token(self):
+        """
+        Async version of get_access_token for use from an event loop.
+        
+        Concurrent coroutines share one refresh via an asyncio.Lock. The
+        blocking refresh itself runs in a worker thread so the event loop
+        is never stalled.
         
+        Returns:
+            str: Valid access token, or None if refresh failed
+        """
+        if self.is_token_valid():
+            return self.access_token
+        
+        if self._async_refresh_lock is None:
+            self._async_refresh_lock = asyncio.Lock()
+        
+        async with self._async_refresh_lock:
+            if self.is_token_valid():
+                return self.access_token
+            
+            return await asyncio.to_thread(self.get_access_token)
+    
+    def _refresh_access_token(self):
+        """
+        Exchange the refresh token for a new access token.
+        
+        Callers must hold self._refresh_lock.
+        
+        Returns:
+            str: New access token, or None if refresh failed
+        """
         try:
-            # Make POST request to Zoho's token endpoint
-            response = requests.post(self.token_url, params=params)
+            # Make POST request to Zoho's token endpoint (body built in __init__)
+            response = self.session.post(
+                self.token_url,
+                data=self._refresh_body,
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                timeout=self.timeout
+            )
             
             # Raise exception if we got an error status code
             response.raise_for_status()
             
-            # Parse JSON response
-            tokens = response.json()
+            # Parse JSON response (always UTF-8, so skip requests' charset sniffing)
+            tokens = json.loads(response.content)
             
             # Check if we got an access token back
             if 'access_token' in tokens:
-                self.access_token = tokens['access_token']
-                print(f"[Auth] Access token refreshed at {datetime.now()}")
+                expires_at = time.time() + int(tokens.get('expires_in', 3600))
+                self._set_token(tokens['access_token'], expires_at)
+                logger.debug("[Auth] Access token refreshed")
+                self._save_cached_token(self.access_token, expires_at)
                 return self.access_token
             else:
                 # Response didn't contain access_token - something's wrong
-                print(f"[Auth] Error: Response missing access_token")
-                print(f"[Auth] Response: {tokens}")
+                logger.error("[Auth] Error: Response missing access_token")
+                logger.error("[Auth] Response: %s", tokens)
                 return None
                 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             # Network error or bad response
-            print(f"[Auth] Network error refreshing token: {e}")
+            logger.error("[Auth] Network error refreshing token: %s", e)
             return None
     
+    def invalidate_token(self, rejected_token):
+        """
+        Discard a rejected access token so the next call refreshes it.
+        
+        Use this when Zoho rejects a token that hasn't expired locally.
+        The on-disk copy is removed too if it holds the same token, so
+        the rejected token isn't simply loaded again.
+        
+        Nothing happens if the current token is no longer the rejected one.
+        When several threads get a 401 for the same token, the first one
+        through clears it and the rest keep the token it then refreshed.
+        
+        Args:
+            rejected_token (str): The token Zoho rejected, as sent in the request
+        """
+        with self._refresh_lock:
+            if self.access_token != rejected_token:
+                return
+            
+            self.access_token = None
+            self.access_token_expiry = 0.0
+            self._token_version += 1
+            
+            cached = self._load_cached_token()
+            if cached and cached[0] == rejected_token:
+                try:
+                    os.remove(self.token_cache_path)
+                except OSError:
+                    pass
+    
+    def start_background_refresh(self, leeway=300):
+        """
+        Keep the token fresh from a background thread.
+        
+        A daemon thread sleeps until `leeway` seconds before the token
+        expires and then refreshes it, so API calls don't have to wait for
+        a refresh. The normal refresh in get_access_token still happens if
+        a background refresh is missed. Calling this again while the thread
+        is running does nothing.
+        
+        Args:
+            leeway (int): Seconds before expiry to refresh the token
+        """
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+        
+        self._stop_refresh.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._background_refresh_loop,
+            args=(leeway,),
+            name="zoho-token-refresh",
+            daemon=True
+        )
+        self._refresh_thread.start()
+    
+    def close(self):
+        """
+        Stop any background refresh and close the HTTP session.
+        
+        A session passed in to the constructor is left open for its owner.
+        """
+        self.stop_background_refresh()
+        if self._owns_session:
+            self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def stop_background_refresh(self):
+        """
+        Stop the background refresh thread, if one is running.
+        """
+        self._stop_refresh.set()
+        
+        if self._refresh_thread:
+            self._refresh_thread.join()
+            self._refresh_thread = None
+    
+    def _background_refresh_loop(self, leeway):
+        """
+        Body of the background refresh thread.
+        
+        Args:
+            leeway (int): Seconds before expiry to refresh the token
+        """
+        while True:
+            with self._refresh_lock:
+                # Refresh now if there's no token yet or it's inside the leeway
+                if time.monotonic() >= self.access_token_expiry - leeway:
+                    self._refresh_access_token()
+                
+                if self.access_token_expiry > time.monotonic():
+                    delay = self.access_token_expiry - leeway - time.monotonic()
+                else:
+                    # Refresh failed - try again shortly
+                    delay = 30
+            
+            # Never spin if the token lifetime is shorter than the leeway
+            if self._stop_refresh.wait(max(delay, 30)):
+                return
+    
+    @property
+    def token_version(self):
+        """
+        Counter that changes whenever access_token changes.
+        
+        Clients can cache anything built from the token (headers, ...) and
+        rebuild it once this no longer matches.
+        
+        Returns:
+            int: Current token version
+        """
+        return self._token_version
+    
     def is_token_valid(self):
         """
         Check if we have a current access token.
         
         Note: This doesn't verify the token is still valid with Zoho,
-        just that we have one stored. Access tokens expire after ~1 hour.
+        just that we have one stored that isn't about to expire
+        (within TOKEN_EXPIRY_LEEWAY seconds). Access tokens expire after
+        ~1 hour.
         
         Returns:
-            bool: True if we have a token stored, False otherwise
+            bool: True if we have an unexpired token, False otherwise
+        """
+        return (
+            self.access_token is not None
+            and time.monotonic() < self.access_token_expiry - TOKEN_EXPIRY_LEEWAY
+        )
+    
+    def _set_token(self, token, expires_at):
         """
-        return self.access_token is not None
\ No newline at end of file
+        Store a new access token and its expiry.
+        
+        Args:
+            token (str): Access token
+            expires_at (float): Expiry time as a Unix timestamp
+        """
+        self.access_token = token
+        self._token_version += 1
+        # Track expiry on the monotonic clock so wall-clock changes can't
+        # make the token look valid for longer than it is
+        self.access_token_expiry = time.monotonic() + (expires_at - time.time())
+    
+    def _load_cached_token(self):
+        """
+        Read the access token cached on disk, if there is a usable one.
+        
+        Returns:
+            tuple: (token, expires_at) for the cached token, or None if it is
+                   missing, expired, or for a different client ID
+        """
+        if not self.token_cache_path:
+            return None
+        
+        try:
+            with open(self.token_cache_path) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if cached.get('client_id') != self.client_id:
+            return None
+        
+        if cached.get('expires_at', 0) <= time.time() + TOKEN_EXPIRY_LEEWAY:
+            return None
+        
+        if not cached.get('token'):
+            return None
+        
+        return cached['token'], cached['expires_at']
+    
+    def _save_cached_token(self, token, expires_at):
+        """
+        Cache the access token on disk for later runs.
+        
+        The file is written privately (mode 0600) to a temporary name and
+        then renamed into place, so concurrent scripts never read a
+        half-written file.
+        
+        Args:
+            token (str): Access token to cache
+            expires_at (float): Expiry time as a Unix timestamp
+        """
+        if not self.token_cache_path:
+            return
+        
+        cache_dir = os.path.dirname(self.token_cache_path)
+        tmp_path = f"{self.token_cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        
+        try:
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump({
+                    'client_id': self.client_id,
+                    'token': token,
+                    'expires_at': expires_at
+                }, f)
+            
+            os.replace(tmp_path, self.token_cache_path)
+            
+        except OSError as e:
+            logger.warning("[Auth] Could not cache access token: %s", e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
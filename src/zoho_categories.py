@@ -0,0 +1,244 @@
+"""
+Zoho Desk category tree helpers.
+Fetches knowledge base category trees, shared by the category scripts.
+"""
+import os
+import json
+import functools
+import hashlib
+import logging
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import NamedTuple
+
+import requests
+
+from src.session import DEFAULT_TIMEOUT, build_session
+
+logger = logging.getLogger(__name__)
+
+
+# One shared HTTP session for every category request, so repeated calls
+# to desk.zoho.com reuse the same TCP/TLS connection
+SESSION = build_session(pool_connections=16, pool_maxsize=16)
+
+# Category trees rarely change, so API responses are cached on disk and
+# reused for an hour. Run with --refresh to ignore the cache.
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "zoho_desk")
+CACHE_TTL = 3600
+
+
+class CatInfo(NamedTuple):
+    """
+    One category from a flattened category tree.
+
+    A NamedTuple is much smaller than a dict per category, which matters
+    for large trees. Use ._asdict() to get a dict for JSON output.
+    """
+    id: str
+    name: str
+    parent_name: str
+    depth: int
+    has_children: bool
+
+
+def disk_cached(func):
+    """
+    Cache a (auth, org_id, category_id) fetch function's JSON result on disk.
+
+    Results are stored in CACHE_DIR, one file per (org_id, category_id),
+    and reused while younger than CACHE_TTL seconds. Failed fetches (None)
+    are never cached. Pass refresh=True to skip the cache lookup and
+    overwrite the stored copy.
+    """
+    @functools.wraps(func)
+    def wrapper(auth, org_id, category_id, refresh=False, **kwargs):
+        key = hashlib.sha1(f"{org_id}:{category_id}".encode()).hexdigest()
+        path = os.path.join(CACHE_DIR, f"{key}.json")
+
+        if not refresh:
+            try:
+                if time.time() - os.path.getmtime(path) < CACHE_TTL:
+                    with open(path) as f:
+                        return json.load(f)
+            except (OSError, ValueError):
+                # Missing or corrupt cache file - fall through to the API
+                pass
+
+        data = func(auth, org_id, category_id, **kwargs)
+
+        if data is not None:
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                # Write to a temp file and rename, so a concurrent reader
+                # never sees a half-written file
+                fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning("Could not cache category %s: %s", category_id, e)
+
+        return data
+
+    return wrapper
+
+
+@disk_cached
+def get_category_tree(auth, org_id, category_id, session=None):
+    """
+    Fetch the complete category tree starting from a category ID.
+    
+    This uses the Zoho Desk API endpoint:
+    GET /categories/{category_id}
+    
+    Returns the category and all its children recursively.
+
+    Responses are cached on disk (see disk_cached); pass refresh=True to
+    bypass the cache.
+
+    Args:
+        auth (ZohoAuth): Authenticated ZohoAuth instance
+        org_id (str): Zoho Desk organization ID
+        category_id (str): Category ID to fetch
+        session (requests.Session, optional): Session to send the request
+                                              on (defaults to SESSION)
+
+    Returns:
+        dict: Category data if successful, None if error
+    """
+    # Cheap when the token is still valid - only refreshes near expiry
+    auth.get_access_token()
+    
+    headers = {
+        "Authorization": f"Zoho-oauthtoken {auth.access_token}",
+        "orgId": org_id,
+        "Accept": "application/json"
+    }
+    
+    url = f"https://desk.zoho.com/api/v1/categories/{category_id}"
+    
+    try:
+        response = (session or SESSION).get(url, headers=headers, timeout=DEFAULT_TIMEOUT)
+        response.raise_for_status()
+        # Parse the bytes directly - the API always sends UTF-8 JSON, so
+        # response.json()'s charset detection is wasted work
+        return json.loads(response.content)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error("Failed to fetch category %s: %s", category_id, e)
+        if hasattr(e, 'response') and e.response:
+            logger.error("Response: %s", e.response.text[:2048])
+        return None
+
+
+def fetch_subtree(auth, org_id, root_id, workers=8, refresh=False, session=None):
+    """
+    Fetch a category and its whole subtree, expanding children in parallel.
+
+    GET /categories/{id} may only return a node's immediate children. Any
+    child that comes back without its own 'categories' list is fetched
+    separately, breadth-first, with up to `workers` requests in flight at
+    once. Children whose subtree was already included in the response are
+    not fetched again, so a fully nested response costs a single request.
+
+    Args:
+        auth (ZohoAuth): Authenticated ZohoAuth instance
+        org_id (str): Zoho Desk organization ID
+        root_id (str): Category ID to start from
+        workers (int): Maximum number of concurrent requests
+        refresh (bool): Bypass the on-disk response cache
+        session (requests.Session, optional): Session to send requests on
+
+    Returns:
+        dict: The root category with every child's 'categories' filled in,
+              or None if the root itself couldn't be fetched
+    """
+    root = get_category_tree(auth, org_id, root_id, refresh=refresh, session=session)
+
+    if not root:
+        return None
+
+    def unexpanded(node):
+        # Children the API returned without their own subtree
+        return [
+            child for child in node.get('categories') or []
+            if child.get('id') and 'categories' not in child
+        ]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {
+            executor.submit(get_category_tree, auth, org_id, child['id'],
+                            refresh=refresh, session=session): child
+            for child in unexpanded(root)
+        }
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                node = pending.pop(future)
+                data = future.result() or {}
+
+                # Mark the node as expanded even if the fetch failed,
+                # so the tree stays consistent for flattening
+                node['categories'] = data.get('categories') or []
+
+                for child in unexpanded(node):
+                    future = executor.submit(get_category_tree, auth, org_id, child['id'],
+                                             refresh=refresh, session=session)
+                    pending[future] = child
+
+    return root
+
+
+def iter_categories(category_data):
+    """
+    Walk a category tree depth-first (pre-order), yielding one CatInfo per category.
+
+    Walks the tree with an explicit stack instead of recursion, so deep
+    trees don't pay for a Python call frame per node. Because this is a
+    generator, callers can handle each category as it is reached without
+    building the whole list first.
+
+    Args:
+        category_data (dict): Category object from API
+
+    Yields:
+        CatInfo: One entry per category
+    """
+    if not category_data:
+        return
+
+    # Each stack entry is (node, parent_name, depth)
+    stack = [(category_data, "", 0)]
+
+    while stack:
+        node, parent_name, depth = stack.pop()
+        name = node.get('name')
+        children = node.get('categories') or []
+
+        yield CatInfo(node.get('id'), name, parent_name, depth, bool(children))
+
+        # When every child is a leaf there's nothing to descend into, so
+        # emit them straight away instead of pushing each onto the stack
+        if not any(child.get('categories') for child in children):
+            for child in children:
+                yield CatInfo(child.get('id'), child.get('name'), name, depth + 1, False)
+            continue
+
+        # Push children in reverse so they pop off in their original order
+        stack.extend((child, name, depth + 1) for child in reversed(children))
+
+
+def flatten_category_tree(category_data):
+    """
+    Flatten a category tree into a list (depth-first, pre-order).
+
+    Args:
+        category_data (dict): Category object from API
+
+    Returns:
+        list: Flattened list of CatInfo entries
+    """
+    return list(iter_categories(category_data))
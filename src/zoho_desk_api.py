@@ -2,8 +2,55 @@
 Zoho Desk API client module.
 Provides methods for interacting with Zoho Desk endpoints.
 """
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 
+from src.cache import TTLCache
+from src.rate_limiter import RateLimiter
+from src.session import DEFAULT_TIMEOUT, build_session
+
+# Ask Zoho to compress responses - article HTML shrinks a lot under gzip.
+# Brotli is only advertised when a decoder is installed.
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+# orjson parses and serializes much faster than the stdlib json module,
+# and works on bytes directly. Fall back to json when it isn't installed.
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    import json
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+
+# ijson parses a response incrementally so a page of articles can be
+# processed one at a time. It is optional - iter_articles falls back to
+# parsing the whole page when it isn't installed.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Error bodies are only logged for debugging, so cap how much we show
+MAX_ERROR_BODY = 2048
+
+# How many times a rate-limited (429) write is retried, and the base delay
+# for exponential backoff when Zoho doesn't send a Retry-After header
+RATE_LIMIT_RETRIES = 4
+RATE_LIMIT_BACKOFF = 1.0
+
+logger = logging.getLogger(__name__)
+
 
 class ZohoDeskAPI:
     """
@@ -25,17 +72,80 @@ class ZohoDeskAPI:
         article = api.get_article_by_id("123456789")
     """
     
-    def __init__(self, auth, org_id):
+    def __init__(self, auth, org_id, session=None, timeout=DEFAULT_TIMEOUT,
+                 cache_maxsize=4096, cache_ttl=300, requests_per_minute=None):
         """
         Initialize the API client.
         
         Args:
             auth (ZohoAuth): An authenticated ZohoAuth instance
             org_id (str): Your Zoho Desk organization ID
+            session (requests.Session, optional): Session to send requests on.
+                                                  A pooled session with retries
+                                                  is created if not given.
+            timeout (float or tuple): Timeout for each request, in seconds
+                                      (a single value or (connect, read))
+            cache_maxsize (int, optional): How many fetched articles to keep in
+                                           memory. None or 0 disables the cache.
+            cache_ttl (float): Seconds a cached article stays valid
+            requests_per_minute (int, optional): Cap on HTTP requests sent by this
+                                                 client, shared by every thread
+                                                 using it. None means no cap.
         """
         self.auth = auth
         self.org_id = org_id
         self.base_url = "https://desk.zoho.com/api/v1"
+        self._articles_url = f"{self.base_url}/articles"
+        
+        # Reuse one session for every call so requests share keep-alive
+        # connections instead of each doing a new TLS handshake
+        self.session = session or build_session()
+        self._owns_session = session is None
+        self.timeout = timeout
+        
+        # Headers only change when the token does, so they're built once per
+        # token and reused. Maps include_content_type -> (token version, headers)
+        self._headers_cache = {}
+        
+        # Multi-pass runs (dry run, then the real one) fetch the same
+        # articles again, so keep recent get_article_by_id results in memory
+        self._article_cache = TTLCache(cache_maxsize, cache_ttl) if cache_maxsize else None
+        
+        # One token bucket for the whole client, so parallel helpers
+        # (get_articles_by_ids, create_articles, get_all_articles) can't
+        # add up to more than Zoho allows. Cache hits don't use a token.
+        self.rate_limiter = RateLimiter(requests_per_minute) if requests_per_minute else None
+    
+    def start(self):
+        """
+        Start refreshing the access token in the background.
+        
+        Call this before a long batch run so requests never wait on a
+        token refresh, and call stop() when the run is done.
+        """
+        self.auth.start_background_refresh()
+    
+    def stop(self):
+        """
+        Stop the background token refresh started by start().
+        """
+        self.auth.stop_background_refresh()
+    
+    def close(self):
+        """
+        Stop any background refresh and close the HTTP session.
+        
+        A session passed in to the constructor is left open for its owner.
+        """
+        self.stop()
+        if self._owns_session:
+            self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
     
     def _get_headers(self, include_content_type=False):
         """
@@ -45,7 +155,8 @@ class ZohoDeskAPI:
         they're meant to be used internally by the class, not called directly.
         
         This ensures we always have a valid access token and proper headers
-        for every API request.
+        for every API request. The dict is cached until the token changes,
+        so callers must not modify it.
         
         Args:
             include_content_type (bool): Whether to add Content-Type header
@@ -54,28 +165,103 @@ class ZohoDeskAPI:
         Returns:
             dict: Headers dictionary ready for requests
         """
-        if not self.auth.access_token:
-            self.auth.get_access_token()
+        # Cheap when the token is still valid - only refreshes near expiry
+        self.auth.get_access_token()
+        
+        # Read the version before the token, so a refresh in between can
+        # only make the cached entry look stale, never wrong
+        token_version = self.auth.token_version
+        cached = self._headers_cache.get(include_content_type)
+        if cached and cached[0] == token_version:
+            return cached[1]
         
         headers = {
             "Authorization": f"Zoho-oauthtoken {self.auth.access_token}",
-            "orgId": self.org_id
+            "orgId": self.org_id,
+            "Accept": "application/json",
+            "Accept-Encoding": ACCEPT_ENCODING
         }
         
         if include_content_type:
             headers["Content-Type"] = "application/json"
         
+        self._headers_cache[include_content_type] = (token_version, headers)
+        
         return headers
     
-    def get_article_by_id(self, article_id):
+    def _request(self, method, url, include_content_type=False, _retried=False, **kwargs):
+        """
+        Send an authenticated request, retrying once on 401.
+        
+        A 401 means Zoho rejected our token even though it hasn't expired
+        locally (revoked, rotated, clock drift). The token that was sent is
+        thrown away (unless another thread already replaced it) and the
+        request is retried once with a freshly refreshed one.
+        
+        A 429 means Zoho's rate limit was hit and the request wasn't
+        processed. The session's Retry policy already handles this for GETs,
+        but never replays POST/PATCH, so those are retried here after the
+        Retry-After delay (or exponential backoff).
+        
+        Args:
+            method (str): HTTP method ("GET", "POST", ...)
+            url (str): Full request URL
+            include_content_type (bool): Whether to send a JSON Content-Type header
+            **kwargs: Passed through to session.request (params, data, ...).
+                      The client's timeout is used unless one is given.
+        
+        Returns:
+            requests.Response: The successful response
+        
+        Raises:
+            requests.exceptions.RequestException: On network errors or an
+                                                  error status code
+        """
+        headers = self._get_headers(include_content_type)
+        kwargs.setdefault('timeout', self.timeout)
+        
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            
+            response = self.session.request(method, url, headers=headers, **kwargs)
+            
+            if response.status_code != 429 or attempt == RATE_LIMIT_RETRIES:
+                break
+            
+            delay = _retry_after(response) or RATE_LIMIT_BACKOFF * 2 ** attempt
+            # Release the connection before retrying - a streamed response
+            # keeps it checked out of the pool until closed
+            response.close()
+            logger.warning("[API] Rate limited (429) on %s, retrying in %.1fs", method, delay)
+            time.sleep(delay)
+        
+        if response.status_code == 401 and not _retried:
+            logger.warning("[API] Access token rejected (401), refreshing and retrying")
+            # Pass the token actually sent, so a concurrent 401 can't discard
+            # a token another thread has just refreshed
+            self.auth.invalidate_token(headers["Authorization"].removeprefix("Zoho-oauthtoken "))
+            response.close()
+            return self._request(method, url, include_content_type, _retried=True, **kwargs)
+        
+        response.raise_for_status()
+        return response
+    
+    def get_article_by_id(self, article_id, bypass_cache=False):
         """
         Fetch a single article by its ID.
         
         This is the method we'll use first to inspect what data we get back
         from Zoho Desk for a single article.
         
+        Recently fetched articles are served from memory (see cache_maxsize
+        in __init__). The cached dict is shared between callers, so treat
+        the result as read-only.
+        
         Args:
             article_id (str): The Zoho Desk article ID
+            bypass_cache (bool): Always fetch from Zoho, ignoring any cached copy.
+                                 The fresh result still replaces the cached one.
         
         Returns:
             dict: Article data if successful, None if error
@@ -88,30 +274,103 @@ class ZohoDeskAPI:
                   - status: PUBLISHED, DRAFT, etc.
                   - and many more...
         """
-        headers = self._get_headers()
+        if self._article_cache is not None and not bypass_cache:
+            article_data = self._article_cache.get(str(article_id))
+            if article_data is not None:
+                logger.debug("[API] Article %s served from cache", article_id)
+                return article_data
+        
         url = f"{self.base_url}/articles/{article_id}"
         
-        print(f"[API] Fetching article {article_id} from {url}")
+        logger.debug("[API] Fetching article %s from %s", article_id, url)
         
         try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            article_data = response.json()
+            response = self._request("GET", url)
+            article_data = _loads(response.content)
+            
+            logger.info("[API] Successfully fetched article: %s", article_data.get('title', 'Untitled'))
             
-            print(f"[API] Successfully fetched article: {article_data.get('title', 'Untitled')}")
+            if self._article_cache is not None:
+                self._article_cache.set(str(article_id), article_data)
             
             return article_data
             
         except requests.exceptions.HTTPError as e:
-            print(f"[API] HTTP error fetching article {article_id}: {e}")
-            print(f"[API] Response: {response.text}")
+            logger.error("[API] HTTP error fetching article %s: %s", article_id, e)
+            logger.error("[API] Response: %s", e.response.text[:MAX_ERROR_BODY])
             return None
             
-        except requests.exceptions.RequestException as e:
-            print(f"[API] Network error fetching article {article_id}: {e}")
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error("[API] Network error fetching article %s: %s", article_id, e)
             return None
     
-    def get_articles(self, limit=None, from_index=None):
+    def get_articles_by_ids(self, article_ids, batch=50, workers=8):
+        """
+        Fetch many articles by ID in as few requests as possible.
+        
+        IDs are requested `batch` at a time through the list endpoint's
+        `ids` filter, with the body included. Anything that doesn't come
+        back that way - the filter isn't honoured, the request failed, or
+        the tenant ignored `include` - is fetched individually with
+        get_article_by_id, `workers` at a time. Articles from either path
+        are cached like get_article_by_id's.
+        
+        Args:
+            article_ids (iterable): Article IDs to fetch
+            batch (int): IDs per list request (max 50)
+            workers (int): Concurrent single-article fetches for the fallback
+        
+        Returns:
+            dict: Article ID -> article data. IDs that couldn't be fetched
+                  are left out.
+        """
+        wanted = list(dict.fromkeys(str(article_id) for article_id in article_ids))
+        batch = min(batch, 50)
+        found = {}
+        
+        for start in range(0, len(wanted), batch):
+            chunk = wanted[start:start + batch]
+            chunk_ids = set(chunk)
+            
+            params = {
+                'orgId': self.org_id,
+                'ids': ",".join(chunk),
+                'limit': len(chunk),
+                # The list view leaves the body out unless asked for it
+                'include': 'answer,tags,attachments'
+            }
+            
+            logger.debug("[API] Fetching %d articles by ID", len(chunk))
+            
+            try:
+                response = self._request("GET", self._articles_url, params=params)
+                articles = (_loads(response.content).get('data') or []) if response.content else []
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.warning("[API] Batch fetch by ID failed, falling back to single fetches: %s", e)
+                continue
+            
+            # Only keep what we asked for, and only if the body came with it
+            for article in articles:
+                article_id = str(article.get('id'))
+                if article_id in chunk_ids and 'answer' in article:
+                    found[article_id] = article
+                    if self._article_cache is not None:
+                        self._article_cache.set(article_id, article)
+        
+        missing = [article_id for article_id in wanted if article_id not in found]
+        
+        if missing:
+            logger.info("[API] Fetching %d articles individually", len(missing))
+            
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for article_id, article in zip(missing, executor.map(self.get_article_by_id, missing)):
+                    if article:
+                        found[article_id] = article
+        
+        logger.info("[API] Fetched %d of %d articles by ID", len(found), len(wanted))
+        return found
+    
+    def get_articles(self, limit=None, from_index=None, department_id=None, include=None):
         """
         Fetch multiple articles from Zoho Desk.
         
@@ -121,6 +380,13 @@ class ZohoDeskAPI:
         Args:
             limit (int, optional): Maximum number of articles to fetch per request (max 100)
             from_index (int, optional): Starting index for pagination
+            department_id (str, optional): Only return articles from this department
+                                           (filtered by Zoho, not locally)
+            include (str, optional): Extra fields to return with each article,
+                                     e.g. "answer,tags,attachments", so a
+                                     separate get_article_by_id isn't needed.
+                                     Check the result for the fields - not every
+                                     tenant honours this.
         
         Returns:
             dict: API response containing:
@@ -128,8 +394,7 @@ class ZohoDeskAPI:
                   - count: Number of articles returned
                   Returns None if error
         """
-        headers = self._get_headers()
-        url = f"{self.base_url}/articles"
+        url = self._articles_url
         
         params = {
             'orgId': self.org_id  # Add orgId as query parameter
@@ -139,58 +404,222 @@ class ZohoDeskAPI:
             params['limit'] = min(limit, 50)
         if from_index is not None:
             params['from'] = from_index
+        if department_id:
+            params['departmentId'] = department_id
+        if include:
+            params['include'] = include
         
-        print(f"[API] Fetching articles (limit={params.get('limit', 'default')}, from={from_index})")
+        logger.debug("[API] Fetching articles (limit=%s, from=%s, department=%s)",
+                     params.get('limit', 'default'), from_index, department_id)
         
         try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
+            response = self._request("GET", url, params=params)
             
-            data = response.json()
+            # Zoho answers a page past the end with 204 No Content
+            if not response.content:
+                logger.info("[API] No articles at from=%s", from_index)
+                return {'data': [], 'count': 0}
+            
+            data = _loads(response.content)
             article_count = len(data.get('data', []))
             
-            print(f"[API] Successfully fetched {article_count} articles")
+            logger.info("[API] Successfully fetched %d articles", article_count)
             
             return data
             
-        except requests.exceptions.RequestException as e:
-            print(f"[API] Error fetching articles: {e}")
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error("[API] Error fetching articles: %s", e)
             if hasattr(e, 'response') and e.response is not None:
-                print(f"[API] Response body: {e.response.text}")
+                logger.error("[API] Response body: %s", e.response.text[:MAX_ERROR_BODY])
             return None
     
-    def get_all_articles(self):
+    def get_articles_paginated(self, department_id=None, per_page=50, include=None, max_pages=2000):
         """
-        Fetch ALL articles using pagination.
+        Yield pages of articles one request at a time.
         
-        Returns:
-            list: All articles from all pages, or None if error
+        Lets a caller stop as soon as it has what it needs - just break out
+        of the loop and no further pages are requested. Paging stops by
+        itself at the first short, empty or failed page.
+        
+        Args:
+            department_id (str, optional): Only return articles from this department
+            per_page (int): Articles per request. Zoho allows at most 50, so
+                            larger values are capped.
+            include (str, optional): Extra fields per article (see get_articles)
+            max_pages (int): Safety cap on the number of pages requested
+        
+        Yields:
+            dict: Each page's get_articles() response (non-empty 'data')
         """
-        all_articles = []
+        per_page = min(per_page, 50)
         from_index = 1
-        batch_size = 50
         
-        print(f"[API] Fetching all articles with pagination...")
-        
-        while True:
-            batch = self.get_articles(limit=batch_size, from_index=from_index)
-            
-            if not batch or 'data' not in batch:
-                break
+        for _ in range(max_pages):
+            page = self.get_articles(
+                limit=per_page,
+                from_index=from_index,
+                department_id=department_id,
+                include=include
+            )
             
-            articles = batch['data']
+            articles = (page or {}).get('data') or []
             if not articles:
-                break
+                return
             
-            all_articles.extend(articles)
-            print(f"[API] Total fetched so far: {len(all_articles)}")
+            yield page
             
-            if len(articles) < batch_size:
-                break
+            if len(articles) < per_page:
+                return
+            from_index += per_page
+    
+    def iter_articles(self, limit=50, from_index=1):
+        """
+        Yield the articles on one page without building the whole page in memory.
+        
+        With ijson installed, articles are parsed straight off the response
+        stream one at a time, so a caller that processes and discards each
+        article never holds the entire page of HTML at once. Without ijson
+        the page is parsed in one go and its articles are yielded in turn.
+        
+        Use get_articles() instead if you want the full response dict.
+        
+        Args:
+            limit (int): Maximum number of articles on the page (max 50)
+            from_index (int): Starting index for pagination
+        
+        Yields:
+            dict: One article object at a time (nothing if the request fails)
+        """
+        url = self._articles_url
+        
+        params = {
+            'orgId': self.org_id,
+            'limit': min(limit, 50),
+            'from': from_index
+        }
+        
+        logger.debug("[API] Streaming articles (limit=%s, from=%s)", params['limit'], from_index)
+        
+        try:
+            response = self._request("GET", url, params=params, stream=ijson is not None)
+        except requests.exceptions.RequestException as e:
+            logger.error("[API] Error fetching articles: %s", e)
+            if hasattr(e, 'response') and e.response is not None:
+                logger.error("[API] Response body: %s", e.response.text[:MAX_ERROR_BODY])
+            return
+        
+        with response:
+            # Zoho answers a page past the end with 204 No Content
+            if response.status_code == 204:
+                return
+            
+            if ijson is None:
+                yield from _loads(response.content).get('data') or ()
+                return
+            
+            # Let urllib3 undo gzip/deflate before ijson sees the bytes
+            response.raw.decode_content = True
+            yield from ijson.items(response.raw, 'data.item')
+    
+    def get_all_articles(self, workers=8, max_pages=2000):
+        """
+        Fetch ALL articles using pagination.
+        
+        The API doesn't tell us the total up front, so pages are fetched in
+        parallel waves: after the first page, `workers` pages are requested
+        at once, and fetching stops at the first page that comes back short.
+        Pages are stitched together in order.
+        
+        A page that comes back empty (Zoho may answer 204, or 400 for a
+        `from` past the end) also ends the listing. Because pages are
+        requested a wave at a time, finding the end costs some wasted
+        requests past it - up to a whole wave (`workers`) of them, exact
+        multiple of the page size or not. Pages in the wave that haven't
+        started yet are cancelled once the end is found.
+        
+        Any other failed page (a 5xx after retries, a timeout, ...) means
+        the listing can't be trusted to be complete, so None is returned
+        rather than a silently truncated list.
+        
+        Args:
+            workers (int): Number of pages to fetch concurrently
+            max_pages (int): Safety cap on pages fetched, in case the API
+                             keeps returning full pages
+        
+        Returns:
+            list: All articles from all pages, or None if any page failed
+        """
+        all_articles = []
+        batch_size = 50
+        
+        logger.info("[API] Fetching all articles with pagination...")
+        
+        def fetch_page(from_index):
+            params = {
+                'orgId': self.org_id,
+                'limit': batch_size,
+                'from': from_index
+            }
             
-            from_index += len(articles)
+            try:
+                response = self._request("GET", self._articles_url, params=params)
+                
+                # Zoho answers a page past the end with 204 No Content
+                if not response.content:
+                    return []
+                
+                return _loads(response.content).get('data') or []
+                
+            except requests.exceptions.HTTPError as e:
+                # ...or sometimes with 400, which is also just the end
+                if from_index > 1 and e.response.status_code == 400:
+                    return []
+                logger.error("[API] Error fetching articles at from=%d: %s", from_index, e)
+                logger.error("[API] Response body: %s", e.response.text[:MAX_ERROR_BODY])
+                return None
+                
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.error("[API] Error fetching articles at from=%d: %s", from_index, e)
+                return None
+        
+        # The first page tells us whether there's anything more to fetch
+        articles = fetch_page(1)
+        if articles is None:
+            return None
+        
+        all_articles.extend(articles)
+        next_index = 1 + batch_size
+        pages_fetched = 1
+        finished = len(articles) < batch_size
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while not finished:
+                wave = min(workers, max_pages - pages_fetched)
+                if wave <= 0:
+                    logger.warning("[API] Stopped after %d pages (max_pages); listing may be incomplete",
+                                   pages_fetched)
+                    break
+                
+                from_indices = [next_index + i * batch_size for i in range(wave)]
+                next_index += wave * batch_size
+                pages_fetched += wave
+                
+                # map() returns pages in request order, whatever order they finish in
+                for articles in executor.map(fetch_page, from_indices):
+                    if articles is None:
+                        logger.error("[API] Page request failed after %d articles; listing is incomplete",
+                                     len(all_articles))
+                        return None
+                    
+                    all_articles.extend(articles)
+                    
+                    if len(articles) < batch_size:
+                        finished = True
+                        break
+                
+                logger.info("[API] Total fetched so far: %d", len(all_articles))
         
-        print(f"[API] Finished! Total articles: {len(all_articles)}")
+        logger.info("[API] Finished! Total articles: %d", len(all_articles))
         return all_articles
     
     def create_article(self, article_data):
@@ -217,27 +646,53 @@ class ZohoDeskAPI:
         Returns:
             dict: Created article data if successful, None if error
         """
-        headers = self._get_headers(include_content_type=True)
-        url = f"{self.base_url}/articles"
+        url = self._articles_url
         
-        print(f"[API] Creating article: {article_data.get('title', 'Untitled')}")
+        logger.debug("[API] Creating article: %s", article_data.get('title', 'Untitled'))
         
         try:
-            response = requests.post(url, headers=headers, json=article_data)
-            response.raise_for_status()
+            response = self._request("POST", url, include_content_type=True, data=_dumps(article_data))
             
-            result = response.json()
+            result = _loads(response.content)
             
-            print(f"[API] Successfully created article with ID: {result.get('id')}")
+            logger.info("[API] Successfully created article with ID: %s", result.get('id'))
             
             return result
             
-        except requests.exceptions.RequestException as e:
-            print(f"[API] Error creating article: {e}")
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error("[API] Error creating article: %s", e)
             if hasattr(e, 'response') and e.response is not None:
-                print(f"[API] Response: {e.response.text}")
+                logger.error("[API] Response: %s", e.response.text[:MAX_ERROR_BODY])
             return None
     
+    def create_articles(self, items, concurrency=8):
+        """
+        Create many articles concurrently over the shared session.
+        
+        Each create is one round-trip, so sending them one after another is
+        bound by latency. Here up to `concurrency` creates are in flight at
+        once, each on its own pooled keep-alive connection. Rate-limited
+        creates are retried with backoff by _request.
+        
+        Args:
+            items (list): Article dicts to create
+            concurrency (int): Maximum simultaneous requests (keep this at or
+                               below the session's pool_maxsize)
+        
+        Returns:
+            list: (item, result) tuples in input order, where result is the
+                  created article dict, None if the API call failed, or the
+                  exception if one was raised
+        """
+        def create_one(article_data):
+            try:
+                return article_data, self.create_article(article_data)
+            except Exception as e:
+                return article_data, e
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(create_one, items))
+    
     def update_article(self, article_id, article_data):
         """
         Update an existing article in Zoho Desk.
@@ -251,23 +706,41 @@ class ZohoDeskAPI:
         Returns:
             dict: Updated article data if successful, None if error
         """
-        headers = self._get_headers(include_content_type=True)
         url = f"{self.base_url}/articles/{article_id}"
         
-        print(f"[API] Updating article {article_id}")
+        logger.debug("[API] Updating article %s", article_id)
         
         try:
-            response = requests.patch(url, headers=headers, json=article_data)
-            response.raise_for_status()
+            response = self._request("PATCH", url, include_content_type=True, data=_dumps(article_data))
             
-            result = response.json()
+            result = _loads(response.content)
             
-            print(f"[API] Successfully updated article {article_id}")
+            logger.info("[API] Successfully updated article %s", article_id)
+            
+            # The cached copy is now out of date
+            if self._article_cache is not None:
+                self._article_cache.pop(str(article_id), None)
             
             return result
             
-        except requests.exceptions.RequestException as e:
-            print(f"[API] Error updating article {article_id}: {e}")
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error("[API] Error updating article %s: %s", article_id, e)
             if hasattr(e, 'response') and e.response is not None:
-                print(f"[API] Response: {e.response.text}")
+                logger.error("[API] Response: %s", e.response.text[:MAX_ERROR_BODY])
             return None
+
+
+def _retry_after(response):
+    """
+    Read a Retry-After header given in seconds.
+    
+    Args:
+        response (requests.Response): Response to read the header from
+    
+    Returns:
+        float: Seconds to wait, or None if the header is missing or not a number
+    """
+    try:
+        return max(0.0, float(response.headers.get('Retry-After')))
+    except (TypeError, ValueError):
+        return None
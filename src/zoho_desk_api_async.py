@@ -0,0 +1,186 @@
+"""
+Async Zoho Desk API client module.
+Provides asyncio-based bulk article creation for large migrations.
+
+Requires the optional httpx package (pip install httpx). The synchronous
+ZohoDeskAPI in zoho_desk_api.py remains the default client.
+"""
+import asyncio
+import logging
+
+import httpx
+
+from src.zoho_desk_api import MAX_ERROR_BODY, RATE_LIMIT_BACKOFF, RATE_LIMIT_RETRIES, _retry_after
+
+logger = logging.getLogger(__name__)
+
+
+class ZohoDeskAPIAsync:
+    """
+    Async client for bulk Zoho Desk write operations.
+
+    Many create_article calls can be in flight at once over a small pool
+    of keep-alive connections, all on one event loop instead of one
+    thread per request.
+
+    Usage:
+        import asyncio
+        from src.zoho_auth import ZohoAuth
+
+        auth = ZohoAuth(client_id, client_secret, refresh_token)
+
+        async def run():
+            async with ZohoDeskAPIAsync(auth, org_id) as api:
+                return await api.create_articles_bulk(articles)
+
+        results = asyncio.run(run())
+    """
+
+    def __init__(self, auth, org_id, max_connections=20, client=None):
+        """
+        Initialize the async API client.
+
+        Args:
+            auth (ZohoAuth): A ZohoAuth instance (shared safely with sync code)
+            org_id (str): Your Zoho Desk organization ID
+            max_connections (int): Maximum open connections to Zoho Desk
+            client (httpx.AsyncClient, optional): Client to send requests on.
+                                                  One is created if not given.
+        """
+        self.auth = auth
+        self.org_id = org_id
+        self.base_url = "https://desk.zoho.com/api/v1"
+
+        self.client = client or httpx.AsyncClient(
+            http2=False,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            timeout=httpx.Timeout(30.0, connect=5.0)
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Close the underlying HTTP client and its connections.
+        """
+        await self.client.aclose()
+
+    async def _get_headers(self, include_content_type=False):
+        """
+        Build request headers with a valid access token.
+
+        Args:
+            include_content_type (bool): Whether to add Content-Type header
+
+        Returns:
+            dict: Headers dictionary ready for httpx
+        """
+        token = await self.auth.a_get_access_token()
+
+        headers = {
+            "Authorization": f"Zoho-oauthtoken {token}",
+            "orgId": self.org_id,
+            "Accept": "application/json"
+        }
+
+        if include_content_type:
+            headers["Content-Type"] = "application/json"
+
+        return headers
+
+    async def _request(self, method, url, include_content_type=False, _retried=False, **kwargs):
+        """
+        Send an authenticated request, retrying once on 401.
+
+        Mirrors ZohoDeskAPI._request: a 429 is retried after the Retry-After
+        delay (or exponential backoff), sleeping without blocking the event
+        loop. httpx doesn't retry anything itself, so without this every
+        rate-limited create in a bulk run would simply fail.
+
+        Returns:
+            httpx.Response: The successful response
+
+        Raises:
+            httpx.HTTPError: On network errors or an error status code
+        """
+        headers = await self._get_headers(include_content_type)
+
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            response = await self.client.request(method, url, headers=headers, **kwargs)
+
+            if response.status_code != 429 or attempt == RATE_LIMIT_RETRIES:
+                break
+
+            delay = _retry_after(response) or RATE_LIMIT_BACKOFF * 2 ** attempt
+            logger.warning("[API] Rate limited (429) on %s, retrying in %.1fs", method, delay)
+            await asyncio.sleep(delay)
+
+        if response.status_code == 401 and not _retried:
+            logger.warning("[API] Access token rejected (401), refreshing and retrying")
+            self.auth.invalidate_token(headers["Authorization"].removeprefix("Zoho-oauthtoken "))
+            return await self._request(method, url, include_content_type, _retried=True, **kwargs)
+
+        response.raise_for_status()
+        return response
+
+    async def create_article(self, article_data):
+        """
+        Create a new article in Zoho Desk.
+
+        Args:
+            article_data (dict): Article fields to create
+                                 (see ZohoDeskAPI.create_article)
+
+        Returns:
+            dict: Created article data if successful, None if error
+        """
+        url = f"{self.base_url}/articles"
+
+        logger.debug("[API] Creating article: %s", article_data.get('title', 'Untitled'))
+
+        try:
+            response = await self._request("POST", url, include_content_type=True, json=article_data)
+            result = response.json()
+
+            logger.info("[API] Successfully created article with ID: %s", result.get('id'))
+
+            return result
+
+        except httpx.HTTPError as e:
+            logger.error("[API] Error creating article: %s", e)
+            if isinstance(e, httpx.HTTPStatusError):
+                logger.error("[API] Response: %s", e.response.text[:MAX_ERROR_BODY])
+            return None
+
+    async def create_articles_bulk(self, list_of_data, concurrency=16):
+        """
+        Create many articles concurrently.
+
+        At most `concurrency` requests are in flight at a time.
+
+        Args:
+            list_of_data (list): Article dicts to create
+            concurrency (int): Maximum simultaneous requests
+
+        Returns:
+            list: One entry per input, in the same order - the created
+                  article dict, None if the API call failed, or the
+                  exception if one was raised
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def create_one(article_data):
+            async with semaphore:
+                return await self.create_article(article_data)
+
+        return await asyncio.gather(
+            *(create_one(article_data) for article_data in list_of_data),
+            return_exceptions=True
+        )
@@ -1,12 +1,24 @@
 """
 Proof of concept: Test Zoho OAuth authentication and make a simple API call.
 This verifies our credentials work before building the full migration system.
+
+Uses the same ZohoAuth and ZohoDeskAPI classes as the migration, so it
+exercises the real session, retry and timeout setup.
+
+Usage:
+    python test_auth.py              # Run the two tests once
+    python test_auth.py --bench 20   # Also time 20 repeated API calls
 """
 import os
-import requests
+import argparse
+import statistics
+import time
 from datetime import datetime
 
-def test_authentication():
+from src.zoho_auth import ZohoAuth
+from src.zoho_desk_api import ZohoDeskAPI
+
+def test_authentication(auth):
     """
     Test 1: Can we get an access token from our refresh token?
     """
@@ -14,53 +26,22 @@ def test_authentication():
     print("TEST 1: Authentication")
     print("=" * 60)
     
-    client_id = os.environ.get('ZOHO_CLIENT_ID')
-    client_secret = os.environ.get('ZOHO_CLIENT_SECRET')
-    refresh_token = os.environ.get('ZOHO_REFRESH_TOKEN')
-    
-    if not all([client_id, client_secret, refresh_token]):
-        print("X Missing credentials in environment variables!")
-        return None
-    
     print("+ Found all credentials")
-    print(f"  Client ID: {client_id[:10]}...")
-    print(f"  Refresh Token: {refresh_token[:10]}...")
+    print(f"  Client ID: {auth.client_id[:10]}...")
+    print(f"  Refresh Token: {auth.refresh_token[:10]}...")
     
-    token_url = "https://accounts.zoho.com/oauth/v2/token"
+    print("\nAttempting to refresh access token...")
     
-    params = {
-        "refresh_token": refresh_token,
-        "client_id": client_id,
-        "client_secret": client_secret,
-        "grant_type": "refresh_token"
-    }
+    access_token = auth.get_access_token()
     
-    print("\nAttempting to refresh access token...")
+    if access_token:
+        print(f"+ SUCCESS! Got access token: {access_token[:20]}...")
+    else:
+        print("X FAILED: Could not refresh access token")
     
-    try:
-        response = requests.post(token_url, params=params)
-        
-        if response.status_code == 200:
-            tokens = response.json()
-            
-            if 'access_token' in tokens:
-                access_token = tokens['access_token']
-                print(f"+ SUCCESS! Got access token: {access_token[:20]}...")
-                return access_token
-            else:
-                print(f"X FAILED: Response missing access_token")
-                print(f"  Response: {tokens}")
-                return None
-        else:
-            print(f"X FAILED: HTTP {response.status_code}")
-            print(f"  Response: {response.text}")
-            return None
-            
-    except Exception as e:
-        print(f"X ERROR: {e}")
-        return None
+    return access_token
 
-def test_api_call(access_token):
+def test_api_call(api):
     """
     Test 2: Can we make a simple API call to Zoho Desk?
     """
@@ -68,68 +49,104 @@ def test_api_call(access_token):
     print("TEST 2: API Call")
     print("=" * 60)
     
-    org_id = os.environ.get('ZOHO_ORG_ID')
+    print(f"+ Using Org ID: {api.org_id}")
+    print(f"\nCalling API: {api.base_url}/articles")
     
-    if not org_id:
-        print("X Missing ZOHO_ORG_ID in environment variables!")
+    data = api.get_articles(limit=3)
+    
+    if data is None:
+        print("X FAILED: API call did not succeed")
         return False
     
-    print(f"+ Using Org ID: {org_id}")
+    articles = data.get('data', [])
     
-    url = "https://desk.zoho.com/api/v1/articles"
+    print(f"+ SUCCESS! API call worked!")
+    print(f"  Found {len(articles)} articles")
     
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {access_token}",
-        "orgId": org_id
-    }
+    if articles:
+        print("\n  Sample articles:")
+        for i, article in enumerate(articles[:3], 1):
+            title = article.get('title', 'Untitled')
+            article_id = article.get('id', 'No ID')
+            print(f"    {i}. [{article_id}] {title}")
     
-    print(f"\nCalling API: {url}")
+    return True
+
+def bench_api_call(api, runs):
+    """
+    Time repeated API calls on one session.
     
-    try:
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code == 200:
-            data = response.json()
-            article_count = len(data.get('data', []))
-            
-            print(f"+ SUCCESS! API call worked!")
-            print(f"  Found {article_count} articles")
-            
-            if article_count > 0:
-                print("\n  Sample articles:")
-                for i, article in enumerate(data['data'][:3], 1):
-                    title = article.get('title', 'Untitled')
-                    article_id = article.get('id', 'No ID')
-                    print(f"    {i}. [{article_id}] {title}")
-            
-            return True
-        else:
-            print(f"X FAILED: HTTP {response.status_code}")
-            print(f"  Response: {response.text}")
-            return False
-            
-    except Exception as e:
-        print(f"X ERROR: {e}")
-        return False
+    The first call pays for the TLS handshake; later calls reuse the
+    pooled connection, which is what the migration sees in practice.
+    
+    Args:
+        api (ZohoDeskAPI): API client to call
+        runs (int): Number of calls to time
+    """
+    print("\n" + "=" * 60)
+    print(f"BENCHMARK: {runs} x get_articles(limit=3)")
+    print("=" * 60)
+    
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        api.get_articles(limit=3)
+        timings.append((time.perf_counter() - start) * 1000)
+    
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    
+    print(f"  min:    {timings[0]:.1f} ms")
+    print(f"  median: {statistics.median(timings):.1f} ms")
+    print(f"  p95:    {p95:.1f} ms")
 
 def main():
     """
     Run all tests in sequence.
     """
+    parser = argparse.ArgumentParser(description="Test Zoho authentication and API access.")
+    parser.add_argument(
+        '--bench',
+        type=int,
+        metavar='N',
+        default=0,
+        help="Time N repeated API calls after the tests pass"
+    )
+    args = parser.parse_args()
+    
     print("\nZOHO DESK API PROOF OF CONCEPT")
     print(f"Started at {datetime.now()}\n")
     
-    access_token = test_authentication()
+    client_id = os.environ.get('ZOHO_CLIENT_ID')
+    client_secret = os.environ.get('ZOHO_CLIENT_SECRET')
+    refresh_token = os.environ.get('ZOHO_REFRESH_TOKEN')
+    org_id = os.environ.get('ZOHO_ORG_ID')
+    
+    if not all([client_id, client_secret, refresh_token]):
+        print("X Missing credentials in environment variables!")
+        return
     
-    if not access_token:
-        print("\nAuthentication failed. Cannot proceed to API test.")
-        print("\nTroubleshooting:")
-        print("  1. Check that your secrets are correctly set in GitHub")
-        print("  2. Verify your refresh token hasn't expired")
-        print("  3. Make sure client ID and secret match your Zoho API Console")
+    if not org_id:
+        print("X Missing ZOHO_ORG_ID in environment variables!")
         return
     
-    api_success = test_api_call(access_token)
+    # Skip the on-disk token cache so this always tests a real refresh
+    with ZohoAuth(client_id, client_secret, refresh_token, token_cache_path=None) as auth, \
+            ZohoDeskAPI(auth, org_id) as api:
+        access_token = test_authentication(auth)
+        
+        if not access_token:
+            print("\nAuthentication failed. Cannot proceed to API test.")
+            print("\nTroubleshooting:")
+            print("  1. Check that your secrets are correctly set in GitHub")
+            print("  2. Verify your refresh token hasn't expired")
+            print("  3. Make sure client ID and secret match your Zoho API Console")
+            return
+        
+        api_success = test_api_call(api)
+        
+        if api_success and args.bench > 0:
+            bench_api_call(api, args.bench)
     
     print("\n" + "=" * 60)
     print("TEST SUMMARY")
@@ -8,19 +8,23 @@ This script:
 4. Creates a duplicate in ACE (or shows what would be created in dry run mode)
 5. Verifies the migration was successful
 
-Run with dry_run=True first to see what would happen without actually creating.
+By default this is a dry run - nothing is created. Options:
+    --apply            Actually create the article in ACE after the dry run
+    --article-id ID    Migrate this SJRRC article instead of the first one listed
+    --cache PATH       Save the fetched article to PATH, and reuse it on later
+                       runs while it is fresh (see --cache-max-age)
 """
 import os
+import sys
 import json
+import time
+import argparse
+import logging
 from datetime import datetime
-from dotenv import load_dotenv
+from itertools import islice
 
-# Load environment variables from .env file
-load_dotenv()
-
-# Import our custom modules
-from src.zoho_auth import ZohoAuth
-from src.zoho_desk_api import ZohoDeskAPI
+# Import our custom modules (test_utils also loads the .env file)
+from src.test_utils import build_api
 from src.migrator import ArticleMigrator
 
 
@@ -28,123 +32,238 @@ from src.migrator import ArticleMigrator
 SJRRC_DEPARTMENT_ID = '986740000000403042'
 ACE_DEPARTMENT_ID = '986740000000006907'
 
+# Article fields shown in the step 4 summary, as (label, field) pairs
+SUMMARY_FIELDS = (
+    ('Title', 'title'),
+    ('Category ID', 'categoryId'),
+    ('Department ID', 'departmentId'),
+    ('Status', 'status'),
+    ('Tags', 'tags'),
+    ('Created', 'createdTime'),
+)
+
+
+def _of_dept(response, department_id):
+    """
+    Lazily yield the articles from a department in a get_articles response.
+    
+    Handles a failed request (None) or empty page the same way, so callers
+    only need one check.
+    
+    Args:
+        response (dict): get_articles() result, or None
+        department_id (str): Department to look for
+    
+    Returns:
+        generator: Matching articles, in page order
+    """
+    data = (response or {}).get('data') or ()
+    return (a for a in data if a.get('departmentId') == department_id)
+
+
+def _first_of_dept(response, department_id):
+    """
+    Find the first article from a department in a get_articles response.
+    
+    Stops scanning at the first match rather than filtering the whole page.
+    
+    Args:
+        response (dict): get_articles() result, or None
+        department_id (str): Department to look for
+    
+    Returns:
+        dict: First matching article, or None
+    """
+    return next(_of_dept(response, department_id), None)
+
+
+def load_cached_article(path, max_age):
+    """
+    Load an article saved by an earlier run, if it is recent enough.
+    
+    Args:
+        path (str): Cache file path
+        max_age (float): Maximum age of the file in seconds
+    
+    Returns:
+        dict: The cached article, or None if missing, stale or unreadable
+    """
+    try:
+        if time.time() - os.path.getmtime(path) > max_age:
+            return None
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_article(path, article):
+    """
+    Save a fetched article so later runs can skip fetching it.
+    
+    Args:
+        path (str): Cache file path
+        article (dict): Article data to save
+    """
+    try:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(article, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"! Could not write article cache {path}: {e}")
+
 
 def main():
     """
     Test migration of a single article.
     """
+    parser = argparse.ArgumentParser(description="Test migrating one SJRRC article to ACE.")
+    parser.add_argument(
+        '--apply',
+        action='store_true',
+        help="Actually create the article (default is a dry run only)"
+    )
+    parser.add_argument(
+        '--article-id',
+        help="SJRRC article ID to migrate (default: first article listed)"
+    )
+    parser.add_argument(
+        '--cache',
+        metavar='PATH',
+        help="Reuse the article saved at PATH by an earlier run, or save it there"
+    )
+    parser.add_argument(
+        '--cache-max-age',
+        type=float,
+        default=3600,
+        metavar='SECONDS',
+        help="How long a cached article stays usable (default: 3600)"
+    )
+    args = parser.parse_args()
+    
+    # Monotonic clock for timing; datetime.now() is only for the banner
+    start_time = time.monotonic()
+    
+    # Show the migrator's progress messages alongside our own output
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    
     print("=" * 70)
     print("SINGLE ARTICLE MIGRATION TEST")
     print(f"Started at {datetime.now()}")
     print("=" * 70)
     
-    # Step 1: Set up authentication
-    print("\n[1/6] Setting up authentication...")
+    # Step 1: Set up authentication and the API client
+    print("\n[1/5] Setting up authentication and API client...")
     
-    auth = ZohoAuth(
-        client_id=os.environ['ZOHO_CLIENT_ID'],
-        client_secret=os.environ['ZOHO_CLIENT_SECRET'],
-        refresh_token=os.environ['ZOHO_REFRESH_TOKEN']
-    )
+    api = build_api()
     
-    if not auth.get_access_token():
+    if api is None:
         print("X Authentication failed!")
         return
     
-    print("+ Authentication successful")
-    
-    # Step 2: Initialize API client
-    print("\n[2/6] Initializing Zoho Desk API client...")
-    
-    api = ZohoDeskAPI(
-        auth=auth,
-        org_id=os.environ['ZOHO_ORG_ID']
-    )
-    
-    print("+ API client ready")
-    
-    # Step 3: Get a test article from SJRRC department
-    print("\n[3/6] Fetching articles from SJRRC department...")
+    print("+ Authentication successful, API client ready")
     
-    # Get articles from SJRRC department
-    # We'll fetch a few and let you pick one
-    articles_response = api.get_articles(limit=5)
+    # Step 2: Get a test article from SJRRC department
+    print("\n[2/5] Fetching articles from SJRRC department...")
     
-    if not articles_response or not articles_response.get('data'):
-        print("X No articles found")
-        return
+    full_article = None
     
-    # Filter for SJRRC department articles
-    sjrrc_articles = [
-        a for a in articles_response['data'] 
-        if a.get('departmentId') == SJRRC_DEPARTMENT_ID
-    ]
-    
-    if not sjrrc_articles:
-        print("X No SJRRC articles found in first 5 results")
-        print("Trying to fetch more...")
-        articles_response = api.get_articles(limit=20)
-        sjrrc_articles = [
-            a for a in articles_response.get('data', [])
-            if a.get('departmentId') == SJRRC_DEPARTMENT_ID
-        ]
-    
-    if not sjrrc_articles:
-        print("X Still no SJRRC articles found")
-        return
+    # A fresh article saved by an earlier run saves both fetches below
+    if args.cache:
+        full_article = load_cached_article(args.cache, args.cache_max_age)
+        if full_article and args.article_id and full_article.get('id') != args.article_id:
+            full_article = None
     
-    print(f"+ Found {len(sjrrc_articles)} SJRRC articles")
-    print("\nAvailable articles:")
-    for i, article in enumerate(sjrrc_articles[:5], 1):
-        print(f"  {i}. [{article['id']}] {article.get('title', 'Untitled')}")
+    from_cache = full_article is not None
     
-    # Use the first one for testing
-    test_article_id = sjrrc_articles[0]['id']
-    print(f"\n+ Using article: {test_article_id}")
+    if from_cache:
+        test_article_id = full_article['id']
+        print(f"+ Using cached article from {args.cache}: {test_article_id}")
+    elif args.article_id:
+        test_article_id = args.article_id
+        print(f"+ Using article: {test_article_id}")
+    else:
+        # Get articles from SJRRC department
+        # Zoho filters by department for us, so every result is an SJRRC article.
+        # We'll fetch a few and let you pick one - small pages, since every
+        # article comes with its full body and we only need the first
+        test_article, page = None, None
+        
+        for page in api.get_articles_paginated(
+            department_id=SJRRC_DEPARTMENT_ID,
+            per_page=5,
+            include='answer,tags,attachments',
+            # Look at no more than 20 articles, as the old fixed 5-then-20 fetch did
+            max_pages=4
+        ):
+            # Use the first one for testing. Zoho should only have returned SJRRC
+            # articles, but check anyway - stopping at the first page with a match
+            test_article = _first_of_dept(page, SJRRC_DEPARTMENT_ID)
+            if test_article is not None:
+                break
+        
+        if test_article is None:
+            print("X No SJRRC articles found")
+            return
+        
+        # Only filter as much of the page as we're going to show
+        print("+ Found SJRRC articles")
+        print("\nAvailable articles:")
+        for i, article in enumerate(islice(_of_dept(page, SJRRC_DEPARTMENT_ID), 5), 1):
+            print(f"  {i}. [{article['id']}] {article.get('title', 'Untitled')}")
+        
+        # The list call already asked for the body, so keep it unless it's missing
+        test_article_id = test_article['id']
+        if 'answer' in test_article:
+            full_article = test_article
+        print(f"\n+ Using article: {test_article_id}")
     
-    # Step 4: Fetch complete article details
-    print("\n[4/6] Fetching complete article details...")
+    # Step 3: Fetch complete article details
+    print("\n[3/5] Fetching complete article details...")
     
-    full_article = api.get_article_by_id(test_article_id)
+    if not full_article:
+        full_article = api.get_article_by_id(test_article_id)
     
     if not full_article:
         print("X Failed to fetch full article")
         return
     
+    # Don't rewrite a cached copy - that would keep it "fresh" forever
+    if args.cache and not from_cache:
+        save_cached_article(args.cache, full_article)
+    
     print("+ Article fetched successfully")
     print(f"\nArticle details:")
-    print(f"  Title: {full_article.get('title')}")
-    print(f"  Category ID: {full_article.get('categoryId')}")
-    print(f"  Department ID: {full_article.get('departmentId')}")
-    print(f"  Status: {full_article.get('status')}")
-    print(f"  Tags: {full_article.get('tags', [])}")
-    print(f"  Created: {full_article.get('createdTime')}")
-    
-    # Show first 200 chars of content
-    answer = full_article.get('answer', '')
-    if len(answer) > 200:
-        print(f"  Content preview: {answer[:200]}...")
-    else:
-        print(f"  Content: {answer}")
     
-    # Step 5: Initialize migrator and test transformation
-    print("\n[5/6] Testing article transformation...")
+    # Look each field up once, then print them all in one go
+    summary = {field: full_article.get(field) for _, field in SUMMARY_FIELDS}
+    if summary['tags'] is None:
+        summary['tags'] = []
+    print("\n".join(f"  {label}: {summary[field]}" for label, field in SUMMARY_FIELDS))
+    
+    # Show first 200 chars of content - one slice, whatever the article size
+    answer = full_article.get('answer') or ''
+    write = sys.stdout.write
+    write("  Content preview: " if len(answer) > 200 else "  Content: ")
+    write(answer[:200])
+    write("...\n" if len(answer) > 200 else "\n")
+    
+    # Step 4: Initialize migrator and test transformation
+    print("\n[4/5] Testing article transformation...")
     
     migrator = ArticleMigrator(
         source_api=api,
         destination_api=api  # Same org, different department
     )
     
-    # First do a dry run to see what would be created
+    # First do a dry run to see what would be created. transform_article
+    # makes no API calls, so the article we already have is reused as-is
     print("\n--- DRY RUN (no actual creation) ---")
-    dry_run_result = migrator.migrate_single_article(
-        article_id=test_article_id,
-        destination_department_id=ACE_DEPARTMENT_ID,
-        dry_run=True
-    )
+    transformed = migrator.transform_article(full_article, ACE_DEPARTMENT_ID)
     
-    if dry_run_result['status'] != 'dry_run':
-        print(f"\nX Dry run failed: {dry_run_result.get('error')}")
+    if not transformed:
+        print("\nX Dry run failed: Category mapping failed")
         print("\nTroubleshooting:")
         print("  1. Check that you created all 5 missing categories in ACE")
         print("  2. Update the PLACEHOLDER values in src/migrator.py with real category IDs")
@@ -152,22 +271,22 @@ def main():
     
     print("\n+ Transformation successful!")
     print("\nTransformed article data:")
-    print(json.dumps(dry_run_result['transformed'], indent=2))
+    print(json.dumps(transformed, indent=2))
     
-    # Step 6: Ask user if they want to actually create the article
-    print("\n[6/6] Ready to create article in ACE department")
+    # Step 5: Ask user if they want to actually create the article
+    print("\n[5/5] Ready to create article in ACE department")
     print("\n" + "=" * 70)
     print("READY TO MIGRATE")
     print("=" * 70)
-    print(f"Source: {full_article.get('title')}")
+    print(f"Source: {summary['title']}")
     print(f"From: SJRRC department")
     print(f"To: ACE department")
     print(f"Category mapping verified: Yes")
     print("=" * 70)
     
-    # For GitHub Actions, we'll default to NOT creating (just dry run)
-    # When running locally, you can change this to True
-    actually_create = False
+    # For GitHub Actions, we default to NOT creating (just dry run)
+    # When running locally, pass --apply to create the article
+    actually_create = args.apply
     
     if actually_create:
         print("\nCreating article in ACE department...")
@@ -192,12 +311,12 @@ def main():
         print("\nDRY RUN ONLY - No article was created")
         print("\nTo actually create the article:")
         print("  1. Review the transformed data above")
-        print("  2. Set actually_create = True in the script")
-        print("  3. Run again")
+        print("  2. Run again with --apply")
     
     print("\n" + "=" * 70)
     print("Test complete!")
     print("=" * 70)
+    print(f"Elapsed: {time.monotonic() - start_time:.2f}s")
 
 
 if __name__ == "__main__":
@@ -7,53 +7,94 @@ This script helps us understand:
 3. The structure and format of the data
 
 Run this to verify you can fetch articles before building the migration.
+Pass --verbose to also print the complete article JSON.
 """
-import os
-import json
+import sys
+import argparse
+import logging
+import time
 from datetime import datetime
 
 # Import our custom modules from the src package
-from src.zoho_auth import ZohoAuth
-from src.zoho_desk_api import ZohoDeskAPI
+from src.test_utils import build_api
+
+# orjson is much faster at pretty-printing big articles - use it when installed
+try:
+    import orjson
+
+    def print_json(obj):
+        # Flush pending text output first so the raw bytes land in order
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2) + b"\n")
+        sys.stdout.buffer.flush()
+except ImportError:
+    import json
+
+    def print_json(obj):
+        json.dump(obj, sys.stdout, indent=2)
+        print()
+
+# Marks a field that isn't in the article at all (as opposed to one set to None)
+_MISSING = object()
+
+# The fields we'll probably need for migration, in display order
+IMPORTANT_FIELDS = (
+    'id',
+    'title',
+    'answer',
+    'categoryId',
+    'categoryName',
+    'departmentId',
+    'status',
+    'authorId',
+    'createdTime',
+    'modifiedTime',
+    'viewCount',
+    'likeCount',
+    'dislikeCount',
+    'commentCount',
+    'tags',
+    'attachments'
+)
+_IMPORTANT_SET = frozenset(IMPORTANT_FIELDS)
 
 
 def main():
     """
     Fetch a single article and display all its details.
     """
+    parser = argparse.ArgumentParser(description="Fetch one article and inspect its fields.")
+    parser.add_argument(
+        '--verbose',
+        action='store_true',
+        help="Also print the complete article JSON"
+    )
+    args = parser.parse_args()
+    
+    # Monotonic clock for timing; datetime.now() is only for the banner
+    start_time = time.monotonic()
+    
+    # Show the API client's per-request log lines alongside our output
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    
     print("=" * 70)
     print("SINGLE ARTICLE FETCH TEST")
     print(f"Started at {datetime.now()}")
     print("=" * 70)
     
-    # Step 1: Set up authentication
-    print("\n[1/4] Setting up authentication...")
+    # Step 1: Set up authentication and the API client
+    print("\n[1/3] Setting up authentication and API client...")
     
-    auth = ZohoAuth(
-        client_id=os.environ['ZOHO_CLIENT_ID'],
-        client_secret=os.environ['ZOHO_CLIENT_SECRET'],
-        refresh_token=os.environ['ZOHO_REFRESH_TOKEN']
-    )
+    api = build_api()
     
-    # Get an access token
-    if not auth.get_access_token():
+    if api is None:
         print("X Authentication failed!")
         return
     
-    print("+ Authentication successful")
+    print("+ Authentication successful, API client ready")
     
-    # Step 2: Initialize API client
-    print("\n[2/4] Initializing Zoho Desk API client...")
-    
-    api = ZohoDeskAPI(
-        auth=auth,
-        org_id=os.environ['ZOHO_ORG_ID']
-    )
-    
-    print("+ API client ready")
-    
-    # Step 3: Fetch a single article
-    print("\n[3/4] Fetching article...")
+    # Step 2: Fetch a single article
+    print("\n[2/3] Fetching article...")
     
     # You need to provide an actual article ID from your Zoho Desk
     # Get this by:
@@ -62,77 +103,71 @@ def main():
     # 3. Click on any article
     # 4. Look at the URL - the number at the end is the article ID
     
-    # For now, let's try to get the first article from the list
-    articles_response = api.get_articles(limit=1)
+    # For now, let's try to get the first article from the list,
+    # asking for the full body in the same request
+    articles_response = api.get_articles(limit=1, include='answer,tags,attachments')
     
     if not articles_response or not articles_response.get('data'):
         print("X No articles found or API error")
         print("Make sure you have at least one article in your Zoho Desk")
         return
     
-    # Get the ID of the first article
-    first_article_id = articles_response['data'][0]['id']
-    print(f"+ Found article ID: {first_article_id}")
+    article = articles_response['data'][0]
+    print(f"+ Found article ID: {article['id']}")
     
-    # Now fetch the full details of that article
-    article = api.get_article_by_id(first_article_id)
-    
-    if not article:
-        print("X Failed to fetch article details")
-        return
+    # Only fetch the full details separately if the list left out the body
+    if 'answer' not in article:
+        article = api.get_article_by_id(article['id'])
+        
+        if not article:
+            print("X Failed to fetch article details")
+            return
     
     print("+ Successfully fetched article")
     
-    # Step 4: Display the article structure
-    print("\n[4/4] Article details:")
+    # Step 3: Display the article structure
+    print("\n[3/3] Article details:")
     print("=" * 70)
     
     # Pretty print the entire article as JSON
-    # This shows us EVERYTHING Zoho returns
-    print(json.dumps(article, indent=2))
+    # This shows us EVERYTHING Zoho returns, but article HTML can be large,
+    # so only when asked - the field summary below covers the usual case
+    if args.verbose:
+        print_json(article)
+    else:
+        print(f"  {article.get('title', 'Untitled')} ({len(article)} fields, "
+              f"{len(article.get('answer') or '')} characters of content)")
+        print("  Run with --verbose to print the full JSON")
     
     print("\n" + "=" * 70)
     print("KEY FIELDS FOR MIGRATION:")
     print("=" * 70)
     
-    # Highlight the fields we'll probably need for migration
-    important_fields = [
-        'id',
-        'title',
-        'answer',
-        'categoryId',
-        'categoryName',
-        'departmentId',
-        'status',
-        'authorId',
-        'createdTime',
-        'modifiedTime',
-        'viewCount',
-        'likeCount',
-        'dislikeCount',
-        'commentCount',
-        'tags',
-        'attachments'
-    ]
+    # Highlight the fields we'll probably need for migration.
+    # One lookup per field; _MISSING tells absent fields apart from None values
+    present = {field: article.get(field, _MISSING) for field in IMPORTANT_FIELDS}
     
     print("\nFields present in this article:")
-    for field in important_fields:
-        if field in article:
-            value = article[field]
-            # Truncate long values for display
-            if isinstance(value, str) and len(value) > 100:
-                display_value = value[:100] + "..."
-            else:
-                display_value = value
-            print(f"  {field}: {display_value}")
-        else:
+    for field, value in present.items():
+        if value is _MISSING:
             print(f"  {field}: (not present)")
+            continue
+        
+        # Truncate long values for display
+        if isinstance(value, str) and len(value) > 100:
+            display_value = value[:100] + "..."
+        else:
+            display_value = value
+        print(f"  {field}: {display_value}")
     
     # Check for any fields we might have missed
     print("\nAll fields in response:")
     print(f"  Total fields: {len(article.keys())}")
     print(f"  Fields: {', '.join(article.keys())}")
     
+    other_fields = article.keys() - _IMPORTANT_SET
+    print(f"  Not in the key fields list: {', '.join(sorted(other_fields)) or '(none)'}")
+    
     print("\n" + "=" * 70)
     print("NEXT STEPS:")
     print("=" * 70)
@@ -142,6 +177,7 @@ def main():
     print("4. Check if 'answer' field contains HTML (common in Zoho Desk)")
     print("5. Ready to move to test_migrate_one.py")
     print("=" * 70)
+    print(f"Elapsed: {time.monotonic() - start_time:.2f}s")
 
 
 if __name__ == "__main__":